@@ -0,0 +1,211 @@
+"""Cohort statistics over the evaluation scores of many interviews.
+
+Scores are held column-wise: one row per evaluated answer, with a session
+index, the question id and a ``(rows, dimensions)`` score matrix. Every
+statistic is a whole-array NumPy operation over that table, so thousands of
+interviews are summarized without a Python loop per answer.
+
+Usage (from the repo root):
+
+    python -m app.analytics                     # straight from the session store
+    python -m app.analytics --npz scores.npz    # from ``app.export --format npz``
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional, Union
+
+import numpy as np
+
+from app import settings
+from app.scoring import SCORE_DIMENSIONS
+from app.session_store import SessionSnapshot, get_session_store
+
+MAX_SCORE = 5
+PERCENTILES = (10, 25, 50, 75, 90)
+CHUNK_ROWS = 4096
+
+
+class ScoreTable:
+    def __init__(
+        self,
+        session_ids: np.ndarray,
+        session_index: np.ndarray,
+        question_ids: np.ndarray,
+        scores: np.ndarray,
+    ):
+        self.session_ids = session_ids
+        self.session_index = session_index
+        self.question_ids = question_ids
+        self.scores = scores
+
+    @classmethod
+    def from_snapshots(
+        cls, snapshots: Iterable[SessionSnapshot], chunk_rows: int = CHUNK_ROWS
+    ) -> "ScoreTable":
+        """Build the table in one pass, filling fixed-size chunks as it goes."""
+        session_ids: list[str] = []
+        chunks: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        index = np.empty(chunk_rows, dtype=np.int32)
+        questions = np.empty(chunk_rows, dtype=np.int32)
+        scores = np.empty((chunk_rows, len(SCORE_DIMENSIONS)), dtype=np.float32)
+        filled = 0
+        for snapshot in snapshots:
+            if not snapshot.evaluations:
+                continue
+            session_ids.append(snapshot.session_id)
+            for question_id, evaluation in snapshot.evaluations.items():
+                row_scores = evaluation["scores"]
+                index[filled] = len(session_ids) - 1
+                questions[filled] = question_id
+                scores[filled] = [float(row_scores.get(d, 0)) for d in SCORE_DIMENSIONS]
+                filled += 1
+                if filled == chunk_rows:
+                    chunks.append((index.copy(), questions.copy(), scores.copy()))
+                    filled = 0
+        chunks.append((index[:filled], questions[:filled], scores[:filled]))
+        return cls(
+            np.array(session_ids, dtype=str),
+            np.concatenate([c[0] for c in chunks]),
+            np.concatenate([c[1] for c in chunks]),
+            np.concatenate([c[2] for c in chunks]),
+        )
+
+    @classmethod
+    def load(cls, source: Union[str, Path, IO[bytes]]) -> "ScoreTable":
+        with np.load(source) as data:
+            return cls(
+                data["session_ids"],
+                data["session_index"],
+                data["question_ids"],
+                data["scores"],
+            )
+
+    def save(self, target: Union[str, Path, IO[bytes]]):
+        np.savez_compressed(
+            target,
+            session_ids=self.session_ids,
+            session_index=self.session_index,
+            question_ids=self.question_ids,
+            scores=self.scores,
+            dimensions=np.array(SCORE_DIMENSIONS),
+        )
+
+    @property
+    def session_count(self) -> int:
+        return len(self.session_ids)
+
+    def session_means(self) -> np.ndarray:
+        """``(sessions, dimensions)`` mean score of each interview."""
+        sums = np.zeros((self.session_count, self.scores.shape[1]), dtype=np.float64)
+        np.add.at(sums, self.session_index, self.scores)
+        counts = np.bincount(self.session_index, minlength=self.session_count)
+        return sums / np.maximum(counts, 1)[:, None]
+
+    def histograms(self) -> np.ndarray:
+        """``(dimensions, MAX_SCORE + 1)`` count of answers at each whole score."""
+        bins = np.clip(np.rint(self.scores), 0, MAX_SCORE).astype(np.intp)
+        return (bins[:, :, None] == np.arange(MAX_SCORE + 1)).sum(axis=0)
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """Percent of the cohort scoring strictly below each value, per column."""
+    ordered = np.sort(values, axis=0)
+    below = np.stack(
+        [
+            np.searchsorted(ordered[:, i], values[:, i], side="left")
+            for i in range(values.shape[1])
+        ],
+        axis=1,
+    )
+    return below / max(len(values), 1) * 100
+
+
+def cohort_report(table: ScoreTable, top: int = 10) -> dict[str, Any]:
+    if not len(table.scores):
+        return {"sessions": 0, "answers": 0, "dimensions": {}, "ranking": []}
+    means = table.session_means()
+    overall = means.mean(axis=1)
+    overall_rank = percentile_ranks(overall[:, None])[:, 0]
+    percentiles = np.percentile(table.scores, PERCENTILES, axis=0)
+    histograms = table.histograms()
+    dimensions = {
+        d: {
+            "mean": round(float(table.scores[:, i].mean()), 2),
+            "std": round(float(table.scores[:, i].std()), 2),
+            "percentiles": {
+                f"p{p}": round(float(percentiles[j, i]), 2)
+                for j, p in enumerate(PERCENTILES)
+            },
+            "histogram": histograms[i].tolist(),
+        }
+        for i, d in enumerate(SCORE_DIMENSIONS)
+    }
+    order = np.argsort(-overall, kind="stable")[:top]
+    ranking = [
+        {
+            "rank": rank,
+            "session_id": str(table.session_ids[i]),
+            "average": round(float(overall[i]), 2),
+            "percentile_rank": round(float(overall_rank[i]), 1),
+        }
+        for rank, i in enumerate(order, start=1)
+    ]
+    return {
+        "sessions": table.session_count,
+        "answers": len(table.scores),
+        "dimensions": dimensions,
+        "ranking": ranking,
+    }
+
+
+_cohort_averages: Optional[tuple[float, dict[str, float]]] = None
+
+
+def cohort_averages() -> dict[str, float]:
+    """Mean score per dimension over every answer in finished interviews.
+
+    Aggregated in SQL over the per-interview score totals and reused for
+    ``COHORT_REFRESH_SECONDS``; empty when there is no store or no finished
+    interview yet. Blocking; run it in a thread.
+    """
+    global _cohort_averages
+    cached = _cohort_averages
+    if cached is not None:
+        computed_at, averages = cached
+        if time.monotonic() - computed_at < settings.COHORT_REFRESH_SECONDS:
+            return averages
+    averages = {}
+    store = get_session_store()
+    if store is not None:
+        answers, sums = store.cohort_score_sums()
+        if answers:
+            averages = {d: round(sums[d] / answers, 2) for d in SCORE_DIMENSIONS}
+    _cohort_averages = (time.monotonic(), averages)
+    return averages
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cohort score statistics.")
+    parser.add_argument("--npz", type=Path, help="Read an exported score table.")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.npz:
+        table = ScoreTable.load(args.npz)
+    else:
+        store = get_session_store()
+        if store is None:
+            print("SESSION_STORE_PATH is empty; pass --npz.", file=sys.stderr)
+            return 1
+        table = ScoreTable.from_snapshots(store.iter_sessions())
+    json.dump(cohort_report(table, args.top), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""HTTP endpoints mounted alongside the Reflex backend."""
+
+import re
+from typing import Mapping, Optional
+
+import reflex as rx
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import (
+    FileResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+
+from app import settings
+from app.audio_cache import get_audio_cache
+from app.blobstore import BlobStore, get_blob_store
+from app.metrics import render_prometheus
+from app.report import REPORTS_DIR
+from app.tts import (
+    AUDIO_VARIANTS,
+    LITE,
+    STANDARD,
+    get_question_stream_source,
+    stream_question_audio,
+)
+
+AUDIO_PATH = "/audio"
+REPORT_DOWNLOAD_PATH = "/reports"
+REPORT_NAME_RE = re.compile(r"[0-9a-f]{32}-v\d+\.json")
+
+SLOW_EFFECTIVE_TYPES = frozenset({"slow-2g", "2g", "3g"})
+# Cached audio is content-addressed: a key's bytes never change.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """The inclusive ``(start, end)`` of a single-range ``Range`` header.
+
+    None means serve the whole blob: no header, or a form not handled here
+    (other units, several ranges). Raises ValueError if the range lies
+    entirely outside the blob.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first or last):
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise ValueError(f"range {header!r} outside {size} bytes")
+    return start, min(end, size - 1)
+
+
+def serve_blob(
+    store: BlobStore,
+    name: str,
+    media_type: str,
+    headers: Mapping[str, str],
+    range_header: str = "",
+) -> Response:
+    """Serve a blob from disk when the store has a path for it, else stream it.
+
+    Remote blobs honour a single-range ``range_header`` by fetching only that
+    range from the store. Opening a remote blob blocks, so call this from a
+    worker thread.
+    """
+    path = store.local_path(name)
+    if path is not None:
+        if not path.exists():
+            return Response(status_code=404)
+        return FileResponse(path, media_type=media_type, headers=headers)
+    size = store.size(name)
+    if size is None:
+        return Response(status_code=404)
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_byte_range(range_header, size) if range_header else None
+    except ValueError:
+        return Response(
+            status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+        )
+    status_code = 200
+    try:
+        if byte_range is None:
+            body = store.open(name)
+            length = size
+        else:
+            start, end = byte_range
+            body = store.open_range(name, start, end)
+            length = end - start + 1
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    except FileNotFoundError:
+        return Response(status_code=404)
+    headers["Content-Length"] = str(length)
+
+    def chunks():
+        remaining = length
+        with body:
+            while remaining > 0 and (chunk := body.read(min(64 * 1024, remaining))):
+                remaining -= len(chunk)
+                yield chunk
+
+    return StreamingResponse(
+        chunks(), status_code=status_code, media_type=media_type, headers=headers
+    )
+
+
+def choose_audio_variant(hints: Mapping[str, str]) -> str:
+    """The lite variant for clients that ask to save data or report a slow link.
+
+    ``hints`` holds the client's ``save-data``, ``ect`` and ``downlink``
+    values, named as the client hint headers.
+    """
+    if LITE not in AUDIO_VARIANTS:
+        return STANDARD
+    if hints.get("save-data", "").lower() == "on":
+        return LITE
+    if hints.get("ect", "").lower() in SLOW_EFFECTIVE_TYPES:
+        return LITE
+    try:
+        downlink = float(hints.get("downlink", ""))
+    except (TypeError, ValueError):
+        return STANDARD
+    return LITE if downlink < settings.AUDIO_LITE_MAX_DOWNLINK_MBPS else STANDARD
+
+
+async def question_audio(request: Request) -> Response:
+    """Question audio by key; the key names the variant.
+
+    Each session picks its variant once (see ``choose_audio_variant``), so
+    the URLs it plays and preloads are the ones its prefetch warmed. Cached
+    files are served with a strong ETag, immutable caching and Range
+    support. Audio that is not cached yet is streamed from TTS as it is
+    synthesized, and is not cacheable by the client. Cache lookups can reach
+    a remote blob store, so they run in the thread pool.
+    """
+    key = request.path_params["key"]
+    cache = get_audio_cache()
+    cached_file = await run_in_threadpool(cache.get, key)
+    if cached_file is not None:
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": IMMUTABLE}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return await run_in_threadpool(
+            serve_blob,
+            cache.store,
+            cached_file,
+            "audio/mpeg",
+            headers,
+            request.headers.get("range", ""),
+        )
+    source = get_question_stream_source(key)
+    if source is None:
+        return Response(status_code=404)
+    return StreamingResponse(
+        stream_question_audio(*source),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+async def report_download(request: Request) -> Response:
+    name = request.path_params["name"]
+    if not REPORT_NAME_RE.fullmatch(name):
+        return Response(status_code=404)
+    return await run_in_threadpool(
+        serve_blob,
+        get_blob_store(REPORTS_DIR),
+        name,
+        "application/json",
+        {"Content-Disposition": 'attachment; filename="interview_report.json"'},
+    )
+
+
+async def metrics_text(request: Request) -> Response:
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+routes = [
+    Route(f"{AUDIO_PATH}/{{key}}", question_audio),
+    Route(f"{REPORT_DOWNLOAD_PATH}/{{name}}", report_download),
+]
+if settings.METRICS_ENABLED:
+    routes.append(Route("/metrics", metrics_text))
+
+api = Starlette(routes=routes)
+
+
+def audio_url(key: str) -> str:
+    return f"{rx.config.get_config().api_url}{AUDIO_PATH}/{key}"
+
+
+def report_download_url(name: str) -> str:
+    return f"{rx.config.get_config().api_url}{REPORT_DOWNLOAD_PATH}/{name}"
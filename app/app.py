@@ -1,4 +1,8 @@
 import reflex as rx
+from app import settings, warmup
+from app.api import api
+from app.questions import ROLE_TITLE
+from app.metrics import StateDeltaMetricsMiddleware
 from app.state import InterviewState
 from app.components.voice_recorder import voice_recorder, ai_avatar, candidate_avatar
 
@@ -17,10 +21,10 @@ def welcome_screen() -> rx.Component:
     return rx.el.div(
         rx.icon("clipboard-pen-line", class_name="w-16 h-16 text-orange-500 mb-6"),
         rx.el.h1(
-            "Sales & BD Interview", class_name="text-4xl font-bold text-gray-800 mb-4"
+            f"{ROLE_TITLE} Interview", class_name="text-4xl font-bold text-gray-800 mb-4"
         ),
         rx.el.p(
-            "Welcome! This is a structured interview for the Sales & Business Development role.",
+            f"Welcome! This is a structured interview for the {ROLE_TITLE} role.",
             class_name="text-lg text-gray-600 mb-8 max-w-2xl text-center",
         ),
         rx.el.div(
@@ -53,13 +57,47 @@ def welcome_screen() -> rx.Component:
     )
 
 
+def question_audio(src: rx.Var[str]) -> rx.Component:
+    """Hidden autoplaying player for the AI interviewer's question."""
+    return rx.el.audio(
+        src=src,
+        auto_play=True,
+        id="question-audio",
+        on_mount=InterviewState.setup_audio_listeners,
+        class_name="hidden",
+    )
+
+
+def preload_audio(src: rx.Var[str]) -> rx.Component:
+    """Fetches the next question's audio into the browser cache ahead of time."""
+    return rx.el.audio(src=src, preload="auto", class_name="hidden")
+
+
+def answer_evaluation() -> rx.Component:
+    """Score and feedback for the current answer; feedback streams in last."""
+    evaluation = InterviewState.get_current_evaluation
+    return rx.cond(
+        evaluation,
+        rx.el.div(
+            rx.el.p(
+                "Score: ",
+                evaluation["overall"].to_string(),
+                " / 5",
+                class_name="text-sm font-semibold text-orange-600",
+            ),
+            rx.el.p(evaluation["feedback"], class_name="text-sm text-gray-600 mt-1"),
+            class_name="w-full max-w-2xl mt-4 p-4 bg-orange-50 border border-orange-100 rounded-lg",
+        ),
+    )
+
+
 def interview_view() -> rx.Component:
     """The main view for the interview questions and answers."""
     return rx.el.div(
         rx.el.header(
             rx.el.div(
                 rx.el.h2(
-                    "Sales & BD Interview", class_name="text-xl font-bold text-gray-800"
+                    f"{ROLE_TITLE} Interview", class_name="text-xl font-bold text-gray-800"
                 ),
                 rx.el.p(
                     f"Question {InterviewState.current_question_index + 1} of {InterviewState.total_questions}",
@@ -84,18 +122,14 @@ def interview_view() -> rx.Component:
                         ai_avatar(),
                         rx.el.div(
                             rx.cond(
-                                InterviewState.current_question["audio_file"],
-                                rx.el.audio(
-                                    src=rx.get_upload_url(
-                                        InterviewState.current_question["audio_file"]
-                                    ),
-                                    auto_play=True,
-                                    id="question-audio",
-                                    on_mount=InterviewState.setup_audio_listeners,
-                                    class_name="hidden",
-                                ),
+                                InterviewState.current_audio_url != "",
+                                question_audio(InterviewState.current_audio_url),
                                 rx.spinner(size="2"),
                             ),
+                            rx.cond(
+                                InterviewState.next_audio_url != "",
+                                preload_audio(InterviewState.next_audio_url),
+                            ),
                             class_name="flex flex-col items-center justify-center h-48",
                         ),
                         candidate_avatar(),
@@ -104,9 +138,15 @@ def interview_view() -> rx.Component:
                     rx.el.div(
                         rx.el.div(
                             rx.cond(
-                                InterviewState.transcript != "",
+                                (InterviewState.transcript != "")
+                                | (InterviewState.interim_transcript != ""),
                                 rx.el.p(
                                     InterviewState.transcript,
+                                    " ",
+                                    rx.el.span(
+                                        InterviewState.interim_transcript,
+                                        class_name="text-gray-400",
+                                    ),
                                     class_name="text-gray-800",
                                 ),
                                 rx.el.p(
@@ -116,6 +156,7 @@ def interview_view() -> rx.Component:
                             ),
                             class_name="w-full max-w-2xl h-40 p-4 bg-white border border-gray-200 rounded-lg overflow-y-auto text-center",
                         ),
+                        answer_evaluation(),
                         class_name="w-full flex flex-col items-center mt-8",
                     ),
                     class_name="w-full flex flex-col items-center justify-center flex-grow",
@@ -174,7 +215,7 @@ def interview_view() -> rx.Component:
 def index() -> rx.Component:
     return rx.el.div(
         rx.cond(InterviewState.interview_started, interview_view(), welcome_screen()),
-        class_name="font-['Inter'] bg-gray-50 w-full min-h-screen flex items-center justify-center",
+        class_name="font-sans bg-gray-50 w-full min-h-screen flex items-center justify-center",
     )
 
 
@@ -182,15 +223,21 @@ from app.results import results_page
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
-    head_components=[
-        rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
-        rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
-        rx.el.link(
-            href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap",
-            rel="stylesheet",
-        ),
-        rx.el.script(src="https://unpkg.com/recharts/umd/Recharts.min.js"),
-    ],
+    api_transformer=api,
+)
+if settings.METRICS_ENABLED:
+    app.add_middleware(StateDeltaMetricsMiddleware())
+if settings.WARMUP_ON_BOOT:
+    app.register_lifespan_task(warmup.warm_up)
+app.add_page(
+    index,
+    title=f"{ROLE_TITLE} Interview",
+    on_load=InterviewState.detect_audio_variant,
+)
+app.add_page(
+    results_page,
+    route="/results",
+    title=f"{ROLE_TITLE} Interview Results",
+    on_load=InterviewState.load_cohort_averages,
 )
-app.add_page(index)
-app.add_page(results_page, route="/results")
\ No newline at end of file
+warmup.app_loaded()
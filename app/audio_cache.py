@@ -0,0 +1,176 @@
+"""Content-addressed, size-bounded cache for synthesized question audio."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from app import settings
+from app.blobstore import BlobStore, get_blob_store
+
+INDEX_FILENAME = "index.json"
+INDEX_FLUSH_SECONDS = 30
+VERIFY_SECONDS = 30
+
+
+def make_audio_key(text: str, voice_id: str, model_id: str, output_format: str) -> str:
+    """Hash everything that affects the synthesized bytes."""
+    payload = json.dumps([text, voice_id, model_id, output_format], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Stores audio in a blob store, keyed by content hash.
+
+    Entries are tracked in an index with their size and last use time so the
+    least recently used blobs can be evicted once the cache grows past
+    ``max_bytes``. Every worker keeps its own copy of the index and adopts
+    blobs written by other workers the first time it looks them up. Saving
+    merges the copy with the stored index entry by entry, so each worker
+    evicts against every worker's entries and no worker's writes are lost
+    for more than one save.
+
+    Lookups may make a round trip to the blob store, so call them from a
+    worker thread. The lock only guards the in-memory index and is never held
+    during blob store I/O.
+    """
+
+    def __init__(self, store: BlobStore, max_bytes: int):
+        self.store = store
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Serializes this worker's read-merge-write cycles on the index.
+        self._save_lock = threading.Lock()
+        self._saved_at = 0.0
+        # Keys this worker dropped since its last save, so the merge does not
+        # bring them back from the stored index.
+        self._removed: set[str] = set()
+        self._index: dict[str, dict] = self._load_index()
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            index = json.loads(self.store.read_bytes(INDEX_FILENAME))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Audio cache index is unreadable, rebuilding: {e}")
+            return {}
+        # Older indexes stored paths relative to the upload dir.
+        for key, entry in index.items():
+            entry["file"] = self._filename(key)
+        return index
+
+    def _save_index(self):
+        """Merge with the stored index, evict over budget and write it back."""
+        with self._save_lock:
+            stored = self._load_index()
+            with self._lock:
+                for key, entry in stored.items():
+                    if key in self._removed:
+                        continue
+                    ours = self._index.get(key)
+                    if ours is None:
+                        self._index[key] = entry
+                    elif entry["last_used"] > ours["last_used"]:
+                        ours["last_used"] = entry["last_used"]
+                evicted = self._evict()
+                self._removed.clear()
+                data = json.dumps(self._index).encode("utf-8")
+                self._saved_at = time.time()
+            self.store.put(INDEX_FILENAME, [data])
+        for entry in evicted:
+            self.store.delete(entry["file"])
+
+    def _adopt(self, key: str) -> Optional[dict]:
+        """Index a blob for ``key`` written by another worker, if there is one."""
+        filename = self._filename(key)
+        size = self.store.size(filename)
+        if size is None:
+            return None
+        now = time.time()
+        entry = {"file": filename, "size": size, "last_used": now, "checked": now}
+        with self._lock:
+            return self._index.setdefault(key, entry)
+
+    def _filename(self, key: str) -> str:
+        return f"{key}.mp3"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the blob name for ``key`` if it is cached."""
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None:
+            entry = self._adopt(key)
+        if entry is None:
+            return None
+        now = time.time()
+        # Another worker may have evicted the blob; confirming that on every
+        # lookup would cost a round trip to a remote store.
+        if now - entry.get("checked", 0) > VERIFY_SECONDS:
+            if not self.store.exists(entry["file"]):
+                with self._lock:
+                    if self._index.get(key) is entry:
+                        del self._index[key]
+                        self._removed.add(key)
+                self._save_index()
+                return None
+            entry["checked"] = now
+        entry["last_used"] = now
+        # Recency only matters for eviction, so hits are persisted lazily.
+        if now - self._saved_at > INDEX_FLUSH_SECONDS:
+            self._save_index()
+        return entry["file"]
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> str:
+        """Write ``chunks`` as the entry for ``key`` and return its blob name."""
+        for _ in self.tee(key, chunks):
+            pass
+        return self._filename(key)
+
+    def tee(self, key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield ``chunks`` while writing them to the entry for ``key``.
+
+        The entry is only committed once the source is fully drained; if the
+        consumer stops early the partial blob is discarded.
+        """
+        filename = self._filename(key)
+        size = 0
+        for chunk in self.store.tee(filename, chunks):
+            size += len(chunk)
+            yield chunk
+        now = time.time()
+        with self._lock:
+            self._index[key] = {
+                "file": filename,
+                "size": size,
+                "last_used": now,
+                "checked": now,
+            }
+            self._removed.discard(key)
+        self._save_index()
+
+    def _evict(self) -> list[dict]:
+        """Drop the least recently used entries over budget and return them."""
+        total = sum(entry["size"] for entry in self._index.values())
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        for key, entry in sorted(
+            self._index.items(), key=lambda item: item[1]["last_used"]
+        ):
+            if total <= self.max_bytes or len(self._index) == 1:
+                break
+            total -= entry["size"]
+            evicted.append(self._index.pop(key))
+        return evicted
+
+
+@lru_cache(maxsize=1)
+def get_audio_cache() -> AudioCache:
+    """The process-wide audio cache."""
+    return AudioCache(
+        get_blob_store(settings.AUDIO_CACHE_DIR), settings.AUDIO_CACHE_MAX_BYTES
+    )
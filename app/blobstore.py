@@ -0,0 +1,283 @@
+"""Shared storage for generated artifacts: question audio, reports and cache
+entries.
+
+Names are content-addressed or otherwise unique, and writes only become
+visible once complete, so any number of workers on any number of hosts can
+read and write the same store without coordinating. ``BLOB_STORE`` selects
+the backend:
+
+- ``local``: files under ``BLOB_STORE_DIR`` (the Reflex upload dir by
+  default). Share it between hosts by mounting the same volume everywhere.
+- ``object``: an S3-compatible bucket (``BLOB_STORE_BUCKET``, through boto3),
+  or, with no bucket configured, a directory-backed stand-in with the same
+  semantics for development and tests.
+"""
+
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Protocol
+
+import reflex as rx
+
+from app import settings
+
+# Blobs are spooled to memory up to this size before an object-store upload.
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+class BlobStore:
+    """Flat name -> bytes storage. Names may contain ``/``."""
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, name: str) -> Optional[int]:
+        raise NotImplementedError
+
+    def open(self, name: str) -> IO[bytes]:
+        """Open ``name`` for reading; raises FileNotFoundError if it is missing."""
+        raise NotImplementedError
+
+    def open_range(self, name: str, start: int, end: int) -> IO[bytes]:
+        """Open bytes ``start`` to ``end`` (inclusive) of ``name``."""
+        raise NotImplementedError
+
+    def tee(self, name: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield ``chunks`` while storing them as ``name``.
+
+        The blob is only published once ``chunks`` is exhausted; if the
+        consumer stops early nothing is written.
+        """
+        raise NotImplementedError
+
+    def delete(self, name: str):
+        raise NotImplementedError
+
+    def local_path(self, name: str) -> Optional[Path]:
+        """A filesystem path for ``name``, if the backend has one."""
+        return None
+
+    def put(self, name: str, chunks: Iterable[bytes]):
+        for _ in self.tee(name, chunks):
+            pass
+
+    def read_bytes(self, name: str) -> bytes:
+        with self.open(name) as f:
+            return f.read()
+
+    def iter_chunks(self, name: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        with self.open(name) as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def exists(self, name: str) -> bool:
+        return self._path(name).exists()
+
+    def size(self, name: str) -> Optional[int]:
+        try:
+            return self._path(name).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def open(self, name: str) -> IO[bytes]:
+        return self._path(name).open("rb")
+
+    def open_range(self, name: str, start: int, end: int) -> IO[bytes]:
+        with self.open(name) as f:
+            f.seek(start)
+            return io.BytesIO(f.read(end - start + 1))
+
+    def tee(self, name: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread, so concurrent writers of the same
+        # name never share a temp file; the last rename wins with equal bytes.
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with tmp_path.open("wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def delete(self, name: str):
+        self._path(name).unlink(missing_ok=True)
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return self._path(name)
+
+
+class ObjectClient(Protocol):
+    """The subset of the boto3 S3 client the object store uses."""
+
+    def put_object(self, *, Bucket: str, Key: str, Body: IO[bytes]) -> dict: ...
+
+    def get_object(self, *, Bucket: str, Key: str, Range: str = ...) -> dict: ...
+
+    def head_object(self, *, Bucket: str, Key: str) -> dict: ...
+
+    def delete_object(self, *, Bucket: str, Key: str) -> dict: ...
+
+
+class DirectoryObjectClient:
+    """Local stand-in for an S3 client: whole-object puts, keys as files."""
+
+    class NoSuchKey(FileNotFoundError):
+        pass
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def put_object(self, *, Bucket: str, Key: str, Body: IO[bytes]) -> dict:
+        path = self._path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".upload")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(Body, f)
+            os.replace(tmp_name, path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return {}
+
+    def get_object(self, *, Bucket: str, Key: str, Range: str = "") -> dict:
+        try:
+            body = self._path(Bucket, Key).open("rb")
+        except FileNotFoundError:
+            raise self.NoSuchKey(Key) from None
+        if Range:
+            start, _, end = Range.removeprefix("bytes=").partition("-")
+            with body:
+                body.seek(int(start))
+                body = io.BytesIO(body.read(int(end) - int(start) + 1))
+        return {"Body": body}
+
+    def head_object(self, *, Bucket: str, Key: str) -> dict:
+        try:
+            return {"ContentLength": self._path(Bucket, Key).stat().st_size}
+        except FileNotFoundError:
+            raise self.NoSuchKey(Key) from None
+
+    def delete_object(self, *, Bucket: str, Key: str) -> dict:
+        self._path(Bucket, Key).unlink(missing_ok=True)
+        return {}
+
+
+def _is_missing(error: Exception) -> bool:
+    if isinstance(error, FileNotFoundError):
+        return True
+    # botocore's ClientError carries the HTTP status of the failed request.
+    response = getattr(error, "response", None) or {}
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status == 404 or response.get("Error", {}).get("Code") in (
+        "404",
+        "NoSuchKey",
+    )
+
+
+class ObjectBlobStore(BlobStore):
+    """Blobs as objects under ``prefix`` in ``bucket``.
+
+    Each blob is uploaded with a single put once it is complete, which object
+    stores make visible atomically.
+    """
+
+    def __init__(self, client: ObjectClient, bucket: str, prefix: str = ""):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    def size(self, name: str) -> Optional[int]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(name))
+        except Exception as e:
+            if _is_missing(e):
+                return None
+            raise
+        return head["ContentLength"]
+
+    def exists(self, name: str) -> bool:
+        return self.size(name) is not None
+
+    def open(self, name: str) -> IO[bytes]:
+        return self._get(name)
+
+    def open_range(self, name: str, start: int, end: int) -> IO[bytes]:
+        return self._get(name, Range=f"bytes={start}-{end}")
+
+    def _get(self, name: str, **kwargs) -> IO[bytes]:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._key(name), **kwargs
+            )
+        except Exception as e:
+            if _is_missing(e):
+                raise FileNotFoundError(name) from e
+            raise
+        return response["Body"]
+
+    def tee(self, name: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+            for chunk in chunks:
+                spool.write(chunk)
+                yield chunk
+            spool.seek(0)
+            self.client.put_object(Bucket=self.bucket, Key=self._key(name), Body=spool)
+
+    def delete(self, name: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(name))
+
+
+def _root_dir() -> Path:
+    if settings.BLOB_STORE_DIR:
+        return Path(settings.BLOB_STORE_DIR)
+    return rx.get_upload_dir()
+
+
+@lru_cache(maxsize=1)
+def _object_client() -> tuple[ObjectClient, str]:
+    if not settings.BLOB_STORE_BUCKET:
+        logging.info("BLOB_STORE_BUCKET is not set; using the directory object store.")
+        return DirectoryObjectClient(_root_dir()), "blobs"
+    # Only needed when a real bucket is configured.
+    import boto3
+
+    return boto3.client("s3"), settings.BLOB_STORE_BUCKET
+
+
+@lru_cache(maxsize=None)
+def get_blob_store(namespace: str) -> BlobStore:
+    """The process-wide store for one kind of artifact, e.g. ``"tts_cache"``."""
+    if settings.BLOB_STORE == "local":
+        return LocalBlobStore(_root_dir() / namespace)
+    if settings.BLOB_STORE == "object":
+        client, bucket = _object_client()
+        return ObjectBlobStore(client, bucket, namespace)
+    raise ValueError(
+        f"Unknown BLOB_STORE {settings.BLOB_STORE!r}; expected 'local' or 'object'"
+    )
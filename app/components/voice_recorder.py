@@ -1,6 +1,11 @@
 import reflex as rx
+from app import settings
 from app.state import InterviewState
 
+RECORDING_LABEL = (
+    "Recording - pause to finish" if settings.VAD_ENABLED else "Recording"
+)
+
 
 def recorder_status() -> rx.Component:
     """Displays the recording status indicator."""
@@ -13,7 +18,7 @@ def recorder_status() -> rx.Component:
             )
         ),
         rx.el.p(
-            rx.cond(InterviewState.is_recording, "Recording", "Ready"),
+            rx.cond(InterviewState.is_recording, RECORDING_LABEL, "Ready"),
             class_name="text-xs font-medium text-gray-500",
         ),
         class_name="flex items-center gap-2",
@@ -0,0 +1,147 @@
+"""Cache of answer evaluations keyed by normalized question and answer text."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from app import settings
+from app.blobstore import BlobStore, get_blob_store
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def make_evaluation_key(
+    question_text: str, answer_text: str, prompt_version: str, model_name: str
+) -> str:
+    payload = json.dumps(
+        [
+            normalize_text(question_text),
+            normalize_text(answer_text),
+            prompt_version,
+            model_name,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """In-memory LRU with a TTL, optionally backed by one JSON blob per entry.
+
+    The memory tier is per worker; the blob tier is shared by every worker
+    using the same store. ``get`` and ``put`` can block on the store, so
+    coroutines use ``get_async`` and ``put_async``, which only leave the
+    event loop when the store is involved.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, store: Optional[BlobStore] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def peek(self, key: str) -> Optional[Any]:
+        """The value if it is in this worker's memory; never reads the store."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self._is_fresh(stored_at):
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.peek(key)
+        if value is not None:
+            return value
+        return self._load(key)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        value = self.peek(key)
+        if value is not None or self.store is None:
+            return value
+        return await asyncio.to_thread(self._load, key)
+
+    def put(self, key: str, value: Any):
+        stored_at = self._put_memory(key, value)
+        self._write_disk(key, stored_at, value)
+
+    async def put_async(self, key: str, value: Any):
+        stored_at = self._put_memory(key, value)
+        if self.store is not None:
+            await asyncio.to_thread(self._write_disk, key, stored_at, value)
+
+    def _load(self, key: str) -> Optional[Any]:
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        with self._lock:
+            self._remember(key, stored_at, value)
+        return value
+
+    def _put_memory(self, key: str, value: Any) -> float:
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, value)
+        return stored_at
+
+    def _remember(self, key: str, stored_at: float, value: Any):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _blob_name(self, key: str) -> str:
+        return f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[tuple[float, Any]]:
+        if self.store is None:
+            return None
+        name = self._blob_name(key)
+        try:
+            record = json.loads(self.store.read_bytes(name))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable evaluation cache entry {key}: {e}")
+            self.store.delete(name)
+            return None
+        if not self._is_fresh(record["stored_at"]):
+            self.store.delete(name)
+            return None
+        return record["stored_at"], record["value"]
+
+    def _write_disk(self, key: str, stored_at: float, value: Any):
+        if self.store is None:
+            return
+        record = json.dumps({"stored_at": stored_at, "value": value})
+        try:
+            self.store.put(self._blob_name(key), [record.encode("utf-8")])
+        except OSError as e:
+            logging.warning(f"Could not persist evaluation cache entry {key}: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_evaluation_cache() -> EvaluationCache:
+    """The process-wide evaluation cache."""
+    store = get_blob_store(settings.EVAL_CACHE_DIR) if settings.EVAL_CACHE_DIR else None
+    return EvaluationCache(
+        settings.EVAL_CACHE_MAX_ENTRIES, settings.EVAL_CACHE_TTL_SECONDS, store
+    )
@@ -0,0 +1,519 @@
+"""Interchangeable answer-evaluation backends."""
+
+import asyncio
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+from app import jsonstream, metrics, prompts, scheduler, settings
+from app.llm import get_anthropic_client, get_gemini_model
+from app.scoring import DIMENSION_LABELS, SCORE_DIMENSIONS
+
+
+class Evaluator:
+    """Scores one answer against the interview rubric."""
+
+    name: str = ""
+    prompt_version: str = prompts.EVALUATION.version
+
+    @property
+    def model_name(self) -> str:
+        raise NotImplementedError
+
+    async def evaluate(self, question_text: str, answer_text: str) -> dict:
+        raise NotImplementedError
+
+    async def evaluate_stream(
+        self, question_text: str, answer_text: str
+    ) -> AsyncIterator[Any]:
+        """Yield the parsed output so far as the model generates it.
+
+        Items are partial documents (see ``jsonstream``); the last one is the
+        whole response. Backends without streaming yield a single result.
+        """
+        yield await self.evaluate(question_text, answer_text)
+
+    async def warm_up(self):
+        """Create clients and open connections ahead of the first evaluation."""
+
+
+class GeminiEvaluator(Evaluator):
+    name = "gemini"
+
+    @property
+    def model_name(self) -> str:
+        return settings.GEMINI_MODEL
+
+    async def evaluate(self, question_text: str, answer_text: str) -> dict:
+        prompt = prompts.build_evaluation_prompt(question_text, answer_text)
+        # The rubric goes in the system instruction so every request starts
+        # with the same prefix, which Gemini caches implicitly.
+        model = get_gemini_model(self.model_name, prompt.system)
+        response = await scheduler.call_async(
+            scheduler.GEMINI,
+            lambda: model.generate_content_async(prompt.user),
+            key=(self.model_name, prompt),
+        )
+        self._record_usage(response)
+        return normalize_evaluation(jsonstream.loads(response.text))
+
+    async def evaluate_stream(
+        self, question_text: str, answer_text: str
+    ) -> AsyncIterator[Any]:
+        prompt = prompts.build_evaluation_prompt(question_text, answer_text)
+        model = get_gemini_model(self.model_name, prompt.system)
+
+        async def open_stream():
+            response = await model.generate_content_async(prompt.user, stream=True)
+            chunks = aiter(response)
+            # Read the first chunk here so the scheduler retries a failed start.
+            return response, chunks, await anext(chunks, None)
+
+        response, chunks, chunk = await scheduler.call_async(
+            scheduler.GEMINI, open_stream
+        )
+        parser = jsonstream.IncrementalParser()
+        while chunk is not None:
+            partial = parser.feed(_chunk_text(chunk))
+            if partial is not None:
+                yield partial
+            chunk = await anext(chunks, None)
+        self._record_usage(response)
+        yield _finish(self.name, parser)
+
+    def _record_usage(self, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            metrics.record_llm_usage(
+                self.name,
+                usage.prompt_token_count,
+                usage.candidates_token_count,
+                getattr(usage, "cached_content_token_count", None),
+            )
+
+    async def warm_up(self):
+        # The model is configured up front; the SDK connects on the first call.
+        await asyncio.to_thread(
+            get_gemini_model, self.model_name, prompts.EVALUATION.system
+        )
+
+
+class AnthropicEvaluator(Evaluator):
+    name = "anthropic"
+
+    @property
+    def model_name(self) -> str:
+        return settings.ANTHROPIC_MODEL
+
+    def _request(self, prompt: prompts.Prompt) -> dict:
+        return {
+            "model": self.model_name,
+            "max_tokens": 1024,
+            "system": [
+                {
+                    "type": "text",
+                    "text": prompt.system,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            # The response is prefilled with the opening brace.
+            "messages": [
+                {"role": "user", "content": prompt.user},
+                {"role": "assistant", "content": "{"},
+            ],
+        }
+
+    async def evaluate(self, question_text: str, answer_text: str) -> dict:
+        client = get_anthropic_client()
+        prompt = prompts.build_evaluation_prompt(question_text, answer_text)
+        message = await scheduler.call_async(
+            scheduler.ANTHROPIC,
+            lambda: client.messages.create(**self._request(prompt)),
+            key=(self.model_name, prompt),
+        )
+        metrics.record_llm_usage(
+            self.name,
+            message.usage.input_tokens,
+            message.usage.output_tokens,
+            getattr(message.usage, "cache_read_input_tokens", None),
+        )
+        return normalize_evaluation(jsonstream.loads("{" + message.content[0].text))
+
+    async def evaluate_stream(
+        self, question_text: str, answer_text: str
+    ) -> AsyncIterator[Any]:
+        client = get_anthropic_client()
+        prompt = prompts.build_evaluation_prompt(question_text, answer_text)
+        stream = await scheduler.call_async(
+            scheduler.ANTHROPIC,
+            lambda: client.messages.create(**self._request(prompt), stream=True),
+        )
+        parser = jsonstream.IncrementalParser()
+        parser.feed("{")
+        usage = None
+        output_tokens = 0
+        async for event in stream:
+            if event.type == "message_start":
+                usage = event.message.usage
+            elif event.type == "message_delta":
+                output_tokens = event.usage.output_tokens
+            elif (
+                event.type == "content_block_delta"
+                and event.delta.type == "text_delta"
+            ):
+                partial = parser.feed(event.delta.text)
+                if partial is not None:
+                    yield partial
+        if usage is not None:
+            metrics.record_llm_usage(
+                self.name,
+                usage.input_tokens,
+                output_tokens,
+                getattr(usage, "cache_read_input_tokens", None),
+            )
+        yield _finish(self.name, parser)
+
+    async def warm_up(self):
+        client = await asyncio.to_thread(get_anthropic_client)
+        # A cheap authenticated request leaves a connection in the pool.
+        await client.models.list(limit=1)
+
+
+def _chunk_text(chunk) -> str:
+    try:
+        return chunk.text
+    except ValueError:
+        # Chunks without text parts, such as a final one carrying only the
+        # finish reason.
+        return ""
+
+
+def _finish(backend: str, parser: jsonstream.IncrementalParser) -> Any:
+    document = parser.finish()
+    if parser.repaired:
+        metrics.EVALUATION_REPAIRS.inc(backend=backend)
+    return document
+
+
+def partial_evaluation(document: Any) -> Optional[dict]:
+    """``document`` as an evaluation once all its scores are in, else None.
+
+    Scores are clamped to the rubric's 0-5 range. A missing ``overall`` is
+    the mean of the scores, and missing feedback is left empty until it
+    arrives.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get("scores"), dict):
+        return None
+    scores = {}
+    for dimension in SCORE_DIMENSIONS:
+        score = document["scores"].get(dimension)
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return None
+        scores[dimension] = max(0, min(5, score))
+    overall = document.get("overall")
+    if isinstance(overall, bool) or not isinstance(overall, (int, float)):
+        overall = round(sum(scores.values()) / len(scores), 2)
+    feedback = document.get("feedback")
+    return {
+        "scores": scores,
+        "feedback": feedback if isinstance(feedback, str) else "",
+        "overall": overall,
+    }
+
+
+# Ends the feedback of a streamed evaluation whose stream failed after its
+# scores were in.
+FEEDBACK_CUT_SHORT = "(The rest of the feedback could not be generated.)"
+
+
+def is_cut_short(evaluation: dict) -> bool:
+    return evaluation["feedback"].endswith(FEEDBACK_CUT_SHORT)
+
+
+def normalize_evaluation(document: Any) -> dict:
+    evaluation = partial_evaluation(document)
+    if evaluation is None:
+        raise jsonstream.ParseError(f"Evaluation without complete scores: {document!r}")
+    return evaluation
+
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+_METRIC_RE = re.compile(r"\d+(?:[.,]\d+)?\s*(?:%|percent|k\b|m\b|x\b)?|\$\s?\d")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have how i if in is it "
+    "me my of on or so that the their them then there they this to was we were "
+    "what when where which who why will with would you your".split()
+)
+_IMPACT_WORDS = frozenset(
+    "increased grew growth revenue closed exceeded quota saved reduced won "
+    "improved doubled tripled pipeline roi margin achieved delivered generated".split()
+)
+_STRATEGY_WORDS = frozenset(
+    "plan strategy approach process research identify qualify prioritize "
+    "segment target analyze framework steps step goal objective map partner".split()
+)
+_STRUCTURE_WORDS = frozenset(
+    "first second third then next finally because therefore result so "
+    "ultimately overall initially afterwards".split()
+)
+_FILLER_WORDS = frozenset("um uh like basically actually literally anyway".split())
+_HEDGE_WORDS = frozenset("maybe guess probably perhaps hopefully somewhat".split())
+
+_FEEDBACK = {
+    "relevance": "Tie your answer more directly to the question that was asked.",
+    "impact": "Quantify your results with concrete numbers, revenue or percentages.",
+    "strategy": "Walk through the plan or steps you took, not just the outcome.",
+    "clarity": "Structure the answer as situation, actions and result.",
+    "communication": "Aim for a concise, confident answer without filler or hedging.",
+}
+
+
+def _band(value: float, full_at: float) -> int:
+    return max(0, min(5, round(5 * value / full_at)))
+
+
+class RubricEvaluator(Evaluator):
+    """Deterministic keyword, length and structure heuristics.
+
+    Needs no network and scores thousands of answers per second, so it backs
+    offline runs and load tests, and stands in when a remote model is slow.
+    """
+
+    name = "local"
+    prompt_version = "rubric-1"
+
+    @property
+    def model_name(self) -> str:
+        return "local-rubric"
+
+    def score(self, question_text: str, answer_text: str) -> dict:
+        words = _WORD_RE.findall(answer_text.lower())
+        if not words:
+            scores = {d: 0 for d in SCORE_DIMENSIONS}
+            return {
+                "scores": scores,
+                "feedback": "No answer was given.",
+                "overall": 0.0,
+            }
+        word_set = set(words)
+        question_terms = set(_WORD_RE.findall(question_text.lower())) - _STOPWORDS
+        sentences = [s for s in _SENTENCE_RE.split(answer_text) if s.strip()]
+        sentence_count = max(len(sentences), 1)
+        avg_sentence_words = len(words) / sentence_count
+
+        overlap = len(question_terms & word_set) / max(len(question_terms), 1)
+        length_factor = min(len(words) / 40, 1.0)
+        relevance = _band(overlap * length_factor, 0.5)
+
+        figures = len(_METRIC_RE.findall(answer_text))
+        impact = _band(figures + len(_IMPACT_WORDS & word_set), 4)
+
+        strategy = _band(len(_STRATEGY_WORDS & word_set), 4)
+
+        markers = len(_STRUCTURE_WORDS & word_set)
+        sentence_fit = 1.0 if 8 <= avg_sentence_words <= 30 else 0.5
+        clarity = _band(
+            min(markers, 4) * sentence_fit + min(sentence_count, 4) / 2, 5
+        )
+
+        fillers = sum(1 for w in words if w in _FILLER_WORDS or w in _HEDGE_WORDS)
+        if 60 <= len(words) <= 300:
+            length_score = 5
+        elif len(words) < 60:
+            length_score = 5 * len(words) / 60
+        else:
+            length_score = max(2, 5 - (len(words) - 300) / 100)
+        filler_penalty = 20 * fillers / len(words)
+        communication = max(0, min(5, round(length_score - filler_penalty)))
+
+        scores = {
+            "relevance": relevance,
+            "impact": impact,
+            "strategy": strategy,
+            "clarity": clarity,
+            "communication": communication,
+        }
+        weakest = min(SCORE_DIMENSIONS, key=scores.__getitem__)
+        strongest = max(SCORE_DIMENSIONS, key=scores.__getitem__)
+        feedback = _FEEDBACK[weakest]
+        if scores[strongest] >= 3:
+            feedback = f"Strongest on {DIMENSION_LABELS[strongest]}. {feedback}"
+        return {
+            "scores": scores,
+            "feedback": feedback,
+            "overall": round(sum(scores.values()) / len(scores), 2),
+        }
+
+    async def evaluate(self, question_text: str, answer_text: str) -> dict:
+        return self.score(question_text, answer_text)
+
+
+EVALUATORS: dict[str, type[Evaluator]] = {
+    GeminiEvaluator.name: GeminiEvaluator,
+    AnthropicEvaluator.name: AnthropicEvaluator,
+    RubricEvaluator.name: RubricEvaluator,
+}
+
+
+def get_evaluator(name: Optional[str] = None) -> Evaluator:
+    """The shared evaluator for ``name``, defaulting to ``EVALUATOR_BACKEND``."""
+    return _get_evaluator(name or settings.EVALUATOR_BACKEND)
+
+
+@lru_cache(maxsize=None)
+def _get_evaluator(name: str) -> Evaluator:
+    try:
+        return EVALUATORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown evaluator backend {name!r}; expected one of {sorted(EVALUATORS)}"
+        ) from None
+
+
+async def _timed_evaluate(
+    evaluator: Evaluator, question_text: str, answer_text: str
+) -> dict:
+    with metrics.EVALUATION_SECONDS.time(backend=evaluator.name):
+        return await evaluator.evaluate(question_text, answer_text)
+
+
+async def evaluate_with_fallback(
+    evaluator: Evaluator, question_text: str, answer_text: str
+) -> tuple[Evaluator, dict]:
+    """Evaluate with ``evaluator``, falling back to the local engine on failure.
+
+    Returns the evaluator that produced the result along with it.
+    """
+    if (
+        isinstance(evaluator, RubricEvaluator)
+        or not settings.EVALUATOR_LOCAL_FALLBACK
+    ):
+        return evaluator, await _timed_evaluate(evaluator, question_text, answer_text)
+    try:
+        return evaluator, await asyncio.wait_for(
+            _timed_evaluate(evaluator, question_text, answer_text),
+            timeout=settings.EVALUATOR_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        metrics.EVALUATION_FAILURES.inc(
+            backend=evaluator.name, reason=_failure_reason(e)
+        )
+        logging.warning(
+            f"{evaluator.name} evaluation failed ({e!r}); using the local rubric engine."
+        )
+    metrics.EVALUATION_FALLBACKS.inc(backend=evaluator.name)
+    local = get_evaluator(RubricEvaluator.name)
+    return local, await _timed_evaluate(local, question_text, answer_text)
+
+
+async def _timed_stream(
+    evaluator: Evaluator,
+    question_text: str,
+    answer_text: str,
+    timeout: Optional[float],
+) -> AsyncIterator[dict]:
+    """Evaluations from ``evaluator.evaluate_stream`` once their scores are in.
+
+    Feedback grows from one item to the next; the last item is final.
+    ``timeout`` only bounds the wait for the scores. If the stream fails
+    after them, the scores are kept and the last item ends the feedback so
+    far with ``FEEDBACK_CUT_SHORT``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    started = time.perf_counter()
+    stream = evaluator.evaluate_stream(question_text, answer_text)
+    document = published = None
+    cut_short = False
+    try:
+        with metrics.EVALUATION_SECONDS.time(backend=evaluator.name):
+            while True:
+                remaining = None
+                if deadline is not None and published is None:
+                    remaining = deadline - loop.time()
+                try:
+                    document = await asyncio.wait_for(anext(stream), remaining)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    if published is None:
+                        raise
+                    metrics.EVALUATION_FAILURES.inc(
+                        backend=evaluator.name, reason=_failure_reason(e)
+                    )
+                    logging.warning(
+                        f"{evaluator.name} evaluation stream failed after its scores ({e!r}); keeping them."
+                    )
+                    cut_short = True
+                    break
+                evaluation = partial_evaluation(document)
+                if evaluation is None or evaluation == published:
+                    continue
+                if published is None:
+                    metrics.EVALUATION_FIRST_SCORE_SECONDS.observe(
+                        time.perf_counter() - started, backend=evaluator.name
+                    )
+                published = evaluation
+                yield evaluation
+    finally:
+        await stream.aclose()
+    if cut_short:
+        feedback = published["feedback"].rstrip()
+        yield {
+            **published,
+            "feedback": f"{feedback} {FEEDBACK_CUT_SHORT}".lstrip(),
+        }
+        return
+    evaluation = normalize_evaluation(document)
+    if evaluation != published:
+        yield evaluation
+
+
+async def stream_with_fallback(
+    evaluator: Evaluator, question_text: str, answer_text: str
+) -> AsyncIterator[tuple[Evaluator, dict]]:
+    """Streaming ``evaluate_with_fallback``.
+
+    Yields ``(evaluator, evaluation)`` as soon as the scores are in and again
+    as the feedback grows; the last item is final. Only a stream that fails
+    or times out before its scores falls back to the local engine.
+    """
+    if (
+        isinstance(evaluator, RubricEvaluator)
+        or not settings.EVALUATOR_LOCAL_FALLBACK
+    ):
+        async for evaluation in _timed_stream(
+            evaluator, question_text, answer_text, None
+        ):
+            yield evaluator, evaluation
+        return
+    try:
+        async for evaluation in _timed_stream(
+            evaluator, question_text, answer_text, settings.EVALUATOR_TIMEOUT_SECONDS
+        ):
+            yield evaluator, evaluation
+        return
+    except Exception as e:
+        metrics.EVALUATION_FAILURES.inc(
+            backend=evaluator.name, reason=_failure_reason(e)
+        )
+        logging.warning(
+            f"{evaluator.name} evaluation stream failed ({e!r}); using the local rubric engine."
+        )
+    metrics.EVALUATION_FALLBACKS.inc(backend=evaluator.name)
+    local = get_evaluator(RubricEvaluator.name)
+    yield local, await _timed_evaluate(local, question_text, answer_text)
+
+
+def _failure_reason(error: Exception) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, jsonstream.ParseError):
+        return "parse"
+    if isinstance(error, scheduler.CircuitOpenError):
+        return "circuit_open"
+    return "error"
@@ -0,0 +1,154 @@
+"""Bulk export of every recorded interview from the session store.
+
+Usage (from the repo root):
+
+    python -m app.export --format ndjson --out interviews.ndjson
+    python -m app.export --format csv --out answers.csv --finished-only
+    python -m app.export --format npz --out scores.npz
+
+Sessions are replayed one at a time from a single ordered scan of the store
+and written as they complete, so memory stays flat however many interviews
+are exported. ``ndjson`` writes one report per session; ``csv`` writes one
+row per answered question; ``npz`` writes the numeric score columns only,
+for ``app.analytics``.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from app.questions import get_question_bank
+from app.scoring import SCORE_DIMENSIONS, build_summary, question_average
+from app.session_store import SessionSnapshot, SessionStore, get_session_store
+
+CSV_COLUMNS = (
+    "session_id",
+    "finished",
+    "question_id",
+    "role",
+    "competency",
+    *SCORE_DIMENSIONS,
+    "overall",
+    "answer",
+    "feedback",
+)
+
+
+def iter_snapshots(
+    store: SessionStore, finished_only: bool = False
+) -> Iterator[SessionSnapshot]:
+    for snapshot in store.iter_sessions():
+        if snapshot.started and (snapshot.finished or not finished_only):
+            yield snapshot
+
+
+def session_record(snapshot: SessionSnapshot) -> dict[str, Any]:
+    """The same shape as the per-candidate report, keyed by session."""
+    return {
+        "session_id": snapshot.session_id,
+        "finished": snapshot.finished,
+        "question_order": snapshot.question_order,
+        "answers": snapshot.answers,
+        "evaluations": snapshot.evaluations,
+        "summary": build_summary(snapshot.evaluations),
+    }
+
+
+def iter_answer_rows(snapshot: SessionSnapshot) -> Iterator[dict[str, Any]]:
+    """One flat row per question that has an answer or an evaluation."""
+    questions = get_question_bank().by_id
+    for question_id in snapshot.question_order:
+        answer = snapshot.answers.get(question_id, "")
+        evaluation = snapshot.evaluations.get(question_id)
+        if not answer and evaluation is None:
+            continue
+        spec = questions.get(question_id)
+        scores = evaluation["scores"] if evaluation else {}
+        yield {
+            "session_id": snapshot.session_id,
+            "finished": int(snapshot.finished),
+            "question_id": question_id,
+            "role": spec.role if spec else "",
+            "competency": spec.competency if spec else "",
+            **{d: scores.get(d, "") for d in SCORE_DIMENSIONS},
+            "overall": round(question_average(scores), 2) if evaluation else "",
+            "answer": answer,
+            "feedback": evaluation.get("feedback", "") if evaluation else "",
+        }
+
+
+def write_ndjson(snapshots: Iterable[SessionSnapshot], f: IO[str]) -> int:
+    count = 0
+    for snapshot in snapshots:
+        f.write(json.dumps(session_record(snapshot), ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(snapshots: Iterable[SessionSnapshot], f: IO[str]) -> int:
+    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for snapshot in snapshots:
+        writer.writerows(iter_answer_rows(snapshot))
+        count += 1
+    return count
+
+
+def write_npz(snapshots: Iterable[SessionSnapshot], f: IO[bytes]) -> int:
+    from app.analytics import ScoreTable
+
+    table = ScoreTable.from_snapshots(snapshots)
+    table.save(f)
+    return table.session_count
+
+
+def export(store: SessionStore, fmt: str, path: Path, finished_only: bool) -> int:
+    """Write every session in ``fmt`` to ``path`` atomically; returns the count."""
+    snapshots = iter_snapshots(store, finished_only)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if fmt == "npz":
+            with tmp_path.open("wb") as f:
+                count = write_npz(snapshots, f)
+        else:
+            writer = write_ndjson if fmt == "ndjson" else write_csv
+            with tmp_path.open("w", encoding="utf-8", newline="") as f:
+                count = writer(snapshots, f)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export recorded interviews.")
+    parser.add_argument("--format", choices=("ndjson", "csv", "npz"), required=True)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument(
+        "--finished-only",
+        action="store_true",
+        help="Skip interviews the candidate has not finished.",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    store = get_session_store()
+    if store is None:
+        logging.error("SESSION_STORE_PATH is empty; there is nothing to export.")
+        return 1
+    count = export(store, args.format, args.out, args.finished_only)
+    logging.info(f"Exported {count} interview(s) to {args.out}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
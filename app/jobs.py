@@ -0,0 +1,182 @@
+"""Priority job pool that runs evaluation and TTS work off the web event loop.
+
+Jobs are queued by priority and run by workers on a dedicated event loop
+thread. Coroutine functions run on that loop, and blocking functions run in
+a thread pool with a thread per worker. Evaluations and speculations get
+``JOB_WORKERS`` workers. Background work (TTS prefetch and warm-up) has its
+own ``JOB_BACKGROUND_WORKERS``, because a job keeps its worker until it
+finishes, including while it waits for a rate limit. A burst of
+prefetches therefore never delays an evaluation. Event handlers
+``await run(...)`` and then write the result into their state, so the web
+worker's loop only ever waits on a future.
+
+All remote evaluation goes through this pool. The API scheduler's asyncio
+limits therefore live on a single loop.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app import metrics, settings
+
+# Lower runs first.
+EVALUATE = 0
+SPECULATE = 1
+TTS_PREFETCH = 2
+WARM_UP = 3
+
+# Priorities from here on run on the background workers.
+BACKGROUND = TTS_PREFETCH
+
+PRIORITY_NAMES = {
+    EVALUATE: "evaluate",
+    SPECULATE: "speculate",
+    TTS_PREFETCH: "tts_prefetch",
+    WARM_UP: "warm_up",
+}
+
+
+class Job:
+    def __init__(self, priority: int, fn: Callable, args: tuple):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+        self.queued_at = time.perf_counter()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def cancel(self):
+        """Drop the job if it has not started, otherwise cancel it if it can be."""
+        if self.future.cancel():
+            return
+        if self._task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    async def wait(self) -> Any:
+        return await asyncio.wrap_future(self.future)
+
+
+class JobPool:
+    def __init__(self, workers: int, background_workers: int):
+        self.workers = max(workers, 1)
+        self.background_workers = max(background_workers, 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers + self.background_workers,
+            thread_name_prefix="job",
+        )
+        self._counter = itertools.count()
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._background_queue: Optional[asyncio.PriorityQueue] = None
+        ready = threading.Event()
+        threading.Thread(
+            target=self._run, args=(ready,), name="job-loop", daemon=True
+        ).start()
+        ready.wait()
+
+    def _run(self, ready: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.PriorityQueue()
+        self._background_queue = asyncio.PriorityQueue()
+        for _ in range(self.workers):
+            self._loop.create_task(self._work(self._queue))
+        for _ in range(self.background_workers):
+            self._loop.create_task(self._work(self._background_queue))
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def _update_queued(self):
+        metrics.JOBS_QUEUED.set(self._queue.qsize() + self._background_queue.qsize())
+
+    def _enqueue(self, job: Job):
+        queue = self._background_queue if job.priority >= BACKGROUND else self._queue
+        queue.put_nowait((job.priority, next(self._counter), job))
+        self._update_queued()
+
+    def submit(self, priority: int, fn: Callable, *args) -> Job:
+        """Queue ``fn(*args)``; safe to call from any thread."""
+        job = Job(priority, fn, args)
+        job._loop = self._loop
+        self._loop.call_soon_threadsafe(self._enqueue, job)
+        return job
+
+    async def run(self, priority: int, fn: Callable, *args) -> Any:
+        """Queue ``fn(*args)`` and wait for its result."""
+        job = self.submit(priority, fn, *args)
+        try:
+            return await job.wait()
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    async def stream(self, priority: int, fn: Callable, *args) -> AsyncIterator[Any]:
+        """Queue the async generator ``fn(*args)`` and yield its items here.
+
+        Items are handed over to the caller's loop as they are produced.
+        """
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        async def forward():
+            async for item in fn(*args):
+                loop.call_soon_threadsafe(items.put_nowait, (False, item))
+
+        job = self.submit(priority, forward)
+        job.future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(items.put_nowait, (True, None))
+        )
+        try:
+            while True:
+                done, item = await items.get()
+                if done:
+                    break
+                yield item
+            await job.wait()
+        finally:
+            if not job.future.done():
+                job.cancel()
+
+    async def _work(self, queue: asyncio.PriorityQueue):
+        while True:
+            _, _, job = await queue.get()
+            self._update_queued()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            metrics.JOB_WAIT_SECONDS.observe(
+                time.perf_counter() - job.queued_at,
+                priority=PRIORITY_NAMES.get(job.priority, str(job.priority)),
+            )
+            if asyncio.iscoroutinefunction(job.fn):
+                job._task = asyncio.ensure_future(job.fn(*job.args))
+            else:
+                job._task = asyncio.ensure_future(
+                    self._loop.run_in_executor(self._executor, job.fn, *job.args)
+                )
+            try:
+                job.future.set_result(await job._task)
+            except BaseException as e:
+                job.future.set_exception(e)
+
+
+@lru_cache(maxsize=1)
+def get_job_pool() -> JobPool:
+    """The process-wide job pool, started on first use."""
+    return JobPool(settings.JOB_WORKERS, settings.JOB_BACKGROUND_WORKERS)
+
+
+def submit(priority: int, fn: Callable, *args) -> Job:
+    return get_job_pool().submit(priority, fn, *args)
+
+
+async def run(priority: int, fn: Callable, *args) -> Any:
+    return await get_job_pool().run(priority, fn, *args)
+
+
+def stream(priority: int, fn: Callable, *args) -> AsyncIterator[Any]:
+    return get_job_pool().stream(priority, fn, *args)
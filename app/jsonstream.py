@@ -0,0 +1,250 @@
+"""Tolerant parsing of JSON documents that arrive in pieces from a model.
+
+``IncrementalParser.feed`` returns the best-effort value of everything
+received so far. Open objects, arrays and strings are treated as closed, and
+a key whose value has not started yet is left out. Numbers and literals that
+may still be growing are also left out, so a value only appears once it is
+final. The one exception is strings: they are returned as far as they have
+arrived, so text can be shown while it streams.
+
+The same parser repairs complete documents. It skips prose or code fences
+around the JSON, accepts unquoted keys and trailing commas, skips stray
+tokens, and closes a truncated document. ``loads`` raises ``ParseError``
+only when no JSON value can be found at all.
+
+Each ``feed`` re-parses the whole buffer. That is linear in the size of the
+document, which is negligible for model responses of a few kilobytes.
+"""
+
+import re
+from typing import Any
+
+_MISSING = object()
+_NO_VALUE = object()
+_WHITESPACE = " \t\r\n"
+# Characters that can extend a number the regex has already matched, e.g.
+# the "." of a "4.5" whose fraction has not arrived yet.
+_NUMBER_CONTINUATION = ".eE+-0123456789"
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_KEY_RE = re.compile(r"[A-Za-z_][\w-]*")
+_LITERALS = {"true": True, "false": False, "null": None}
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class ParseError(ValueError):
+    """No JSON value could be recovered from the text."""
+
+
+class _Parser:
+    def __init__(self, text: str, final: bool):
+        self.text = text
+        # Whether the text is complete, so values at its end are final too.
+        self.final = final
+        self.pos = 0
+        self.repaired = False
+
+    @property
+    def at_end(self) -> bool:
+        return self.pos >= len(self.text)
+
+    def skip_whitespace(self):
+        while not self.at_end and self.text[self.pos] in _WHITESPACE:
+            self.pos += 1
+
+    def document(self) -> Any:
+        starts = [i for i in (self.text.find("{"), self.text.find("[")) if i >= 0]
+        if not starts:
+            return _MISSING
+        self.pos = min(starts)
+        if self.pos and self.text[: self.pos].strip():
+            self.repaired = True
+        return self.value()
+
+    def value(self) -> Any:
+        self.skip_whitespace()
+        if self.at_end:
+            return _MISSING
+        char = self.text[self.pos]
+        if char == "{":
+            return self.object()
+        if char == "[":
+            return self.array()
+        if char == '"':
+            text, closed = self.string()
+            if not closed:
+                self.repaired = True
+            return text
+        match = _NUMBER_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            if not self.final and (
+                self.at_end or self.text[self.pos] in _NUMBER_CONTINUATION
+            ):
+                self.pos = len(self.text)
+                return _MISSING
+            number = match.group()
+            is_float = any(c in number for c in ".eE")
+            return float(number) if is_float else int(number)
+        rest = self.text[self.pos : self.pos + 5]
+        for word, literal in _LITERALS.items():
+            if rest.startswith(word):
+                self.pos += len(word)
+                return literal
+            if word.startswith(rest) and self.pos + len(rest) == len(self.text):
+                self.pos = len(self.text)
+                return _MISSING
+        raise ParseError(f"Unexpected {char!r} at offset {self.pos}")
+
+    def string(self) -> tuple[str, bool]:
+        """The string at ``pos`` and whether its closing quote was reached."""
+        self.pos += 1
+        parts = []
+        while not self.at_end:
+            char = self.text[self.pos]
+            if char == '"':
+                self.pos += 1
+                return "".join(parts), True
+            if char != "\\":
+                parts.append(char)
+                self.pos += 1
+                continue
+            escape = self.text[self.pos + 1 : self.pos + 2]
+            if not escape:
+                break
+            if escape == "u":
+                digits = self.text[self.pos + 2 : self.pos + 6]
+                if len(digits) < 4:
+                    break
+                try:
+                    parts.append(chr(int(digits, 16)))
+                except ValueError:
+                    self.repaired = True
+                    parts.append(digits)
+                self.pos += 6
+                continue
+            if escape not in _ESCAPES:
+                self.repaired = True
+            parts.append(_ESCAPES.get(escape, escape))
+            self.pos += 2
+        self.pos = len(self.text)
+        return "".join(parts), False
+
+    def key(self) -> Any:
+        if self.text[self.pos] == '"':
+            text, closed = self.string()
+            return text if closed else _MISSING
+        match = _KEY_RE.match(self.text, self.pos)
+        if match is None:
+            return None
+        self.repaired = True
+        self.pos = match.end()
+        if self.at_end and not self.final:
+            return _MISSING
+        return match.group()
+
+    def object(self) -> dict:
+        self.pos += 1
+        result = {}
+        while True:
+            self.skip_whitespace()
+            if self.at_end:
+                self.repaired = True
+                return result
+            char = self.text[self.pos]
+            if char == "}":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                continue
+            key = self.key()
+            if key is None:
+                # A stray token, e.g. the "/5" in "4/5": skip it.
+                self.repaired = True
+                self.pos += 1
+                continue
+            self.skip_whitespace()
+            if key is _MISSING or self.at_end:
+                self.repaired = True
+                return result
+            if self.text[self.pos] == ":":
+                self.pos += 1
+            else:
+                self.repaired = True
+            value = self.member_value()
+            if value is _MISSING:
+                self.repaired = True
+                return result
+            if value is not _NO_VALUE:
+                result[key] = value
+
+    def array(self) -> list:
+        self.pos += 1
+        result = []
+        while True:
+            self.skip_whitespace()
+            if self.at_end:
+                self.repaired = True
+                return result
+            char = self.text[self.pos]
+            if char == "]":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                continue
+            value = self.member_value()
+            if value is _MISSING:
+                self.repaired = True
+                return result
+            if value is not _NO_VALUE:
+                result.append(value)
+
+    def member_value(self) -> Any:
+        """A value inside a container, skipping characters that cannot start one."""
+        while True:
+            try:
+                return self.value()
+            except ParseError:
+                self.repaired = True
+                if self.text[self.pos] in ",}]":
+                    return _NO_VALUE
+                self.pos += 1
+
+
+class IncrementalParser:
+    def __init__(self):
+        self._text = ""
+        self.repaired = False
+
+    def feed(self, text: str) -> Any:
+        """Add ``text`` and return the value so far, or None before it starts."""
+        self._text += text
+        value = _Parser(self._text, final=False).document()
+        return None if value is _MISSING else value
+
+    def finish(self) -> Any:
+        """The value of the whole document, repaired if needed."""
+        parser = _Parser(self._text, final=True)
+        value = parser.document()
+        if value is _MISSING:
+            raise ParseError(f"No JSON value in {self._text[:80]!r}")
+        self.repaired = parser.repaired
+        return value
+
+
+def loads(text: str) -> Any:
+    """Parse a complete but possibly malformed JSON document."""
+    value = _Parser(text, final=True).document()
+    if value is _MISSING:
+        raise ParseError(f"No JSON value in {text[:80]!r}")
+    return value
@@ -0,0 +1,60 @@
+"""Process-wide LLM clients shared by every session on a worker.
+
+The provider SDKs are slow to import, so each is only imported the first time
+its client is needed (or by the boot warm-up, see app/warmup.py).
+"""
+
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from app import settings
+
+if TYPE_CHECKING:
+    import anthropic
+    import google.generativeai as genai
+
+_configure_lock = threading.Lock()
+_gemini_configured = False
+
+
+def _configure_gemini():
+    global _gemini_configured
+    with _configure_lock:
+        if _gemini_configured:
+            return
+        if not settings.GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY not set")
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        _gemini_configured = True
+
+
+@lru_cache(maxsize=None)
+def get_gemini_model(
+    model_name: str = settings.GEMINI_MODEL,
+    system_instruction: Optional[str] = None,
+) -> "genai.GenerativeModel":
+    """A JSON-mode Gemini model, created once per model and system instruction.
+
+    The underlying client keeps its connection open between calls, so
+    concurrent interviews reuse it instead of reconnecting per evaluation.
+    """
+    _configure_gemini()
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(
+        model_name,
+        generation_config={"response_mime_type": "application/json"},
+        system_instruction=system_instruction,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_client() -> "anthropic.AsyncAnthropic":
+    if not settings.ANTHROPIC_API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY not set")
+    import anthropic
+
+    return anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
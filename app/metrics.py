@@ -0,0 +1,327 @@
+"""In-process counters and histograms rendered in Prometheus text format."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from reflex.middleware import Middleware
+
+from app import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+ANSWER_BUCKETS = (5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+TOKEN_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(
+    names: tuple[str, ...], values: LabelValues, extra: str = ""
+) -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[LabelValues, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            # Per-bucket counts followed by the running sum and total count.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(series)) for key, series in self._series.items()
+            )
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labels, key, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.labels, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {series[-2]}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {series[-1]}"
+
+
+_registry: list = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+TTS_SECONDS = _register(
+    Histogram(
+        "interview_tts_seconds",
+        "Time to produce question audio.",
+        ("source",),
+    )
+)
+TTS_BYTES = _register(
+    Counter("interview_tts_bytes_total", "Audio bytes produced by TTS.", ("source",))
+)
+TTS_ERRORS = _register(
+    Counter("interview_tts_errors_total", "Failed TTS requests.", ("status",))
+)
+EVALUATION_SECONDS = _register(
+    Histogram(
+        "interview_evaluation_seconds",
+        "Model time per answer evaluation.",
+        ("backend",),
+    )
+)
+EVALUATION_FIRST_SCORE_SECONDS = _register(
+    Histogram(
+        "interview_evaluation_first_score_seconds",
+        "Time until a streamed evaluation's scores are complete.",
+        ("backend",),
+    )
+)
+EVALUATION_REPAIRS = _register(
+    Counter(
+        "interview_evaluation_repairs_total",
+        "Streamed evaluations whose output was malformed JSON and was repaired.",
+        ("backend",),
+    )
+)
+EVALUATION_PENDING_SECONDS = _register(
+    Histogram(
+        "interview_evaluation_pending_seconds",
+        "How long is_evaluating stays true for an answer; streamed "
+        "evaluations clear it at the first complete scores.",
+    )
+)
+EVALUATIONS_IN_FLIGHT = _register(
+    Gauge("interview_evaluations_in_flight", "Answer evaluations currently running.")
+)
+EVALUATION_CACHE = _register(
+    Counter(
+        "interview_evaluation_cache_total",
+        "Evaluation cache lookups.",
+        ("result",),
+    )
+)
+EVALUATION_FAILURES = _register(
+    Counter(
+        "interview_evaluation_failures_total",
+        "Evaluations that failed, by reason.",
+        ("backend", "reason"),
+    )
+)
+EVALUATION_FALLBACKS = _register(
+    Counter(
+        "interview_evaluation_fallbacks_total",
+        "Evaluations answered by the local engine after a remote failure.",
+        ("backend",),
+    )
+)
+EVALUATION_SPECULATIONS = _register(
+    Counter(
+        "interview_evaluation_speculations_total",
+        "Evaluations started before recording stopped, by outcome.",
+        ("result",),
+    )
+)
+LLM_TOKENS = _register(
+    Counter(
+        "interview_llm_tokens_total",
+        "Tokens reported by the model provider.",
+        ("backend", "kind"),
+    )
+)
+API_REQUESTS = _register(
+    Counter(
+        "interview_api_requests_total",
+        "Outbound API attempts, by provider and outcome.",
+        ("provider", "outcome"),
+    )
+)
+API_WAIT_SECONDS = _register(
+    Histogram(
+        "interview_api_wait_seconds",
+        "Time spent waiting for a rate-limit token and a concurrency slot.",
+        ("provider",),
+    )
+)
+API_CIRCUIT_OPEN = _register(
+    Gauge(
+        "interview_api_circuit_open",
+        "1 while a provider's circuit breaker is open.",
+        ("provider",),
+    )
+)
+JOBS_QUEUED = _register(
+    Gauge("interview_jobs_queued", "Jobs waiting for a job pool worker.")
+)
+JOB_WAIT_SECONDS = _register(
+    Histogram(
+        "interview_job_wait_seconds",
+        "Time jobs spend queued before a worker picks them up.",
+        ("priority",),
+    )
+)
+PROMPT_TOKENS = _register(
+    Histogram(
+        "interview_prompt_tokens",
+        "Estimated tokens per rendered prompt, by template.",
+        ("template",),
+        TOKEN_BUCKETS,
+    )
+)
+PROMPT_TRIMMED = _register(
+    Counter(
+        "interview_prompt_trimmed_total",
+        "Prompts whose answer was cut down to the token budget.",
+        ("template",),
+    )
+)
+STARTUP_SECONDS = _register(
+    Gauge(
+        "interview_startup_seconds",
+        "Time spent on each start-up and warm-up step of this worker.",
+        ("step",),
+    )
+)
+ANSWER_SPEECH_SECONDS = _register(
+    Histogram(
+        "interview_answer_speech_seconds",
+        "Voiced length of answers, without leading and trailing silence, by how "
+        "recording ended (vad or manual).",
+        ("end",),
+        ANSWER_BUCKETS,
+    )
+)
+FINALIZE_SECONDS = _register(
+    Histogram("interview_finalize_seconds", "Time to build the final report.")
+)
+TRANSCRIPT_EVENTS = _register(
+    Counter(
+        "interview_transcript_events_total",
+        "Transcript sync events received.",
+        ("event",),
+    )
+)
+TRANSCRIPT_BYTES = _register(
+    Counter(
+        "interview_transcript_bytes_total",
+        "Transcript text bytes received from the browser.",
+        ("event",),
+    )
+)
+STATE_DELTA_BYTES = _register(
+    Histogram(
+        "interview_state_delta_bytes",
+        "Serialized size of sampled state updates, by event handler.",
+        ("event",),
+        BYTE_BUCKETS,
+    )
+)
+
+
+def record_llm_usage(
+    backend: str,
+    input_tokens: Optional[int],
+    output_tokens: Optional[int],
+    cached_tokens: Optional[int] = None,
+):
+    """Record provider-reported usage; ``cached_tokens`` are prompt cache hits."""
+    if input_tokens:
+        LLM_TOKENS.inc(input_tokens, backend=backend, kind="input")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, backend=backend, kind="output")
+    if cached_tokens:
+        LLM_TOKENS.inc(cached_tokens, backend=backend, kind="cached")
+
+
+class StateDeltaMetricsMiddleware(Middleware):
+    """Samples the size of state updates sent back for each event."""
+
+    def __init__(self, sample_every: int = settings.METRICS_DELTA_SAMPLE_EVERY):
+        self.sample_every = max(sample_every, 1)
+        self._seen = 0
+
+    async def preprocess(self, app, state, event):
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        self._seen += 1
+        if self._seen % self.sample_every == 0:
+            STATE_DELTA_BYTES.observe(
+                len(update.json()), event=event.name.rpartition(".")[2]
+            )
+        return update
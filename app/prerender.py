@@ -0,0 +1,90 @@
+"""Pre-render question audio for whole question banks ahead of time.
+
+Usage (from the repo root, with ELEVENLABS_API_KEY set):
+
+    python -m app.prerender                  # every role
+    python -m app.prerender --role sales_bd --workers 8
+
+Every audio variant (standard and, if configured, lite) is rendered.
+Questions whose audio is already cached for the configured voice, model and
+output format are skipped, so the command is cheap to re-run after editing a
+bank.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import settings
+from app.questions import get_question_bank
+from app.tts import (
+    AUDIO_VARIANTS,
+    cached_question_audio,
+    get_elevenlabs_client,
+    synthesize_question_audio,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render question audio.")
+    parser.add_argument(
+        "--role",
+        action="append",
+        help="Role to render; repeat for several. Defaults to every role.",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=sorted(AUDIO_VARIANTS),
+        help="Audio variant to render; repeat for several. Defaults to all.",
+    )
+    parser.add_argument("--workers", type=int, default=settings.TTS_MAX_CONCURRENCY)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    bank = get_question_bank()
+    roles = args.role or list(bank.roles)
+    variants = args.variant or list(AUDIO_VARIANTS)
+    questions = [q for role in roles for q in bank.for_role(role)]
+    pending = [
+        (q, variant)
+        for q in questions
+        for variant in variants
+        if cached_question_audio(q.text, variant) is None
+    ]
+    total = len(questions) * len(variants)
+    logging.info(
+        f"{len(questions)} questions in {len(roles)} role(s), {len(variants)} "
+        f"variant(s); {total - len(pending)} already rendered, "
+        f"{len(pending)} to render."
+    )
+    if not pending:
+        return 0
+    if get_elevenlabs_client() is None:
+        logging.error("ELEVENLABS_API_KEY is not set; cannot render audio.")
+        return 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        results = list(
+            pool.map(
+                lambda item: synthesize_question_audio(
+                    item[0].id, item[0].text, item[1]
+                ),
+                pending,
+            )
+        )
+    failed = [item for item, filename in zip(pending, results) if filename is None]
+    logging.info(
+        f"Rendered {len(pending) - len(failed)} audio file(s) in "
+        f"{time.perf_counter() - started:.1f}s."
+    )
+    for q, variant in failed:
+        logging.error(f"Failed to render {variant} audio for question {q.id} ({q.role}).")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
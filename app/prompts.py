@@ -0,0 +1,134 @@
+"""Versioned prompt templates for the model-backed evaluators.
+
+A template has a static ``system`` prefix (the rubric and output format) and a
+short per-call ``user`` part. The prefix is byte-identical on every call, so
+providers can serve it from their prompt cache. Gemini does this implicitly
+for repeated prefixes and Anthropic through ``cache_control``. Changing
+either part of a template means bumping its version, which also invalidates
+cached evaluations.
+
+Long answers are cut down to ``EVALUATION_ANSWER_TOKEN_BUDGET`` before they
+are sent. The opening, the closing and any sentences with numbers are kept,
+and gaps are marked with ``[...]``.
+"""
+
+import re
+import string
+from typing import NamedTuple
+
+from app import metrics, settings
+from app.questions import ROLE_TITLE
+
+# Rough English average; close enough for budgeting without a tokenizer.
+CHARS_PER_TOKEN = 4
+OMISSION_MARK = "[...]"
+
+# Web Speech transcripts often have no punctuation, so long runs of words
+# are split into chunks of this size before selecting what to keep.
+_CHUNK_WORDS = 25
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_SALIENT_RE = re.compile(r"\d|%|\$")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class Prompt(NamedTuple):
+    system: str
+    user: str
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.system) + estimate_tokens(self.user)
+
+
+class PromptTemplate:
+    def __init__(self, name: str, version: str, system: str, user: str):
+        self.name = name
+        self.version = version
+        self.system = system
+        self.user = user
+        self.fields = frozenset(
+            field for _, field, _, _ in string.Formatter().parse(user) if field
+        )
+
+    def render(self, **values: str) -> Prompt:
+        missing = self.fields.difference(values)
+        if missing:
+            raise ValueError(f"Prompt {self.name!r} is missing {sorted(missing)}")
+        return Prompt(self.system, self.user.format_map(values))
+
+
+EVALUATION = PromptTemplate(
+    name="evaluation",
+    # The role is part of the system prefix, so it is part of the version.
+    version=f"3-{settings.INTERVIEW_ROLE}",
+    system=f"You are an expert {ROLE_TITLE} interview evaluator.\n\n"
+    + """The next message contains an interview question and the candidate's answer. Evaluate the answer based on the following rubric, providing a score from 0 to 5 for each category:
+- Relevance: How relevant and on-topic was the answer?
+- Impact/Results: Did the candidate mention measurable outcomes or clear achievements?
+- Strategy/Approach: Did they describe a clear plan or thought process?
+- Clarity & Structure: Was the response well-organized and logical?
+- Communication & Confidence: How clear and confident was their delivery?
+
+Long answers may have passages omitted, marked with [...]. Do not penalize the omissions themselves.
+
+Return a JSON object with this exact structure:
+{
+  "scores": { "relevance": <score>, "impact": <score>, "strategy": <score>, "clarity": <score>, "communication": <score> },
+  "feedback": "<short, constructive feedback text>",
+  "overall": <average_score>
+}
+""",
+    user="Question: {question_text}\nCandidate's Answer: {answer_text}\n",
+)
+
+
+def _passages(text: str) -> list[str]:
+    passages = []
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        words = sentence.split()
+        for start in range(0, len(words), _CHUNK_WORDS):
+            passages.append(" ".join(words[start : start + _CHUNK_WORDS]))
+    return passages
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """``text`` unchanged if it fits in ``max_tokens``, else an extract that does."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    passages = _passages(text)
+    last = len(passages) - 1
+    preferred = [0, 1, last, last - 1] + [
+        i for i, passage in enumerate(passages) if _SALIENT_RE.search(passage)
+    ]
+    kept: set[int] = set()
+    used = 0
+    for i in preferred + list(range(len(passages))):
+        if i in kept or not 0 <= i <= last:
+            continue
+        cost = estimate_tokens(passages[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        kept.add(i)
+        used += cost
+    parts = []
+    previous = -1
+    for i in sorted(kept):
+        if i != previous + 1:
+            parts.append(OMISSION_MARK)
+        parts.append(passages[i])
+        previous = i
+    if previous != last:
+        parts.append(OMISSION_MARK)
+    return " ".join(parts)
+
+
+def build_evaluation_prompt(question_text: str, answer_text: str) -> Prompt:
+    answer = fit_to_budget(answer_text, settings.EVALUATION_ANSWER_TOKEN_BUDGET)
+    if answer is not answer_text:
+        metrics.PROMPT_TRIMMED.inc(template=EVALUATION.name)
+    prompt = EVALUATION.render(question_text=question_text, answer_text=answer)
+    metrics.PROMPT_TOKENS.observe(prompt.estimated_tokens, template=EVALUATION.name)
+    return prompt
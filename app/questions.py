@@ -0,0 +1,107 @@
+"""The interview question registry, shared read-only by every session.
+
+Question banks are JSON files in ``QUESTION_BANK_DIR``, one per role::
+
+    {"role": "sales_bd", "title": "Sales & BD",
+     "questions": [{"id": 1, "competency": "results", "text": "..."}]}
+
+They are loaded once per process into an index by role, competency and id.
+Question ids must be unique across all banks.
+"""
+
+import json
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from app import settings
+
+
+class QuestionSpec(NamedTuple):
+    id: int
+    text: str
+    role: str = ""
+    competency: str = ""
+
+
+class QuestionBank:
+    """Immutable index over every loaded question."""
+
+    def __init__(self, titles: Mapping[str, str], questions: list[QuestionSpec]):
+        by_id: dict[int, QuestionSpec] = {}
+        by_role: dict[str, list[QuestionSpec]] = defaultdict(list)
+        by_competency: dict[str, list[QuestionSpec]] = defaultdict(list)
+        for question in questions:
+            if question.id in by_id:
+                raise ValueError(
+                    f"Duplicate question id {question.id} in roles "
+                    f"{by_id[question.id].role!r} and {question.role!r}"
+                )
+            by_id[question.id] = question
+            by_role[question.role].append(question)
+            by_competency[question.competency].append(question)
+        self.titles = MappingProxyType(dict(titles))
+        self.by_id = MappingProxyType(by_id)
+        self.by_role = MappingProxyType({k: tuple(v) for k, v in by_role.items()})
+        self.by_competency = MappingProxyType(
+            {k: tuple(v) for k, v in by_competency.items()}
+        )
+
+    @property
+    def roles(self) -> tuple[str, ...]:
+        return tuple(self.by_role)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def for_role(self, role: str) -> tuple[QuestionSpec, ...]:
+        try:
+            return self.by_role[role]
+        except KeyError:
+            raise ValueError(
+                f"Unknown interview role {role!r}; expected one of {sorted(self.by_role)}"
+            ) from None
+
+
+def load_question_bank(bank_dir: Path) -> QuestionBank:
+    titles = {}
+    questions = []
+    for path in sorted(bank_dir.glob("*.json")):
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        role = data["role"]
+        titles[role] = data.get("title", role)
+        questions.extend(
+            QuestionSpec(
+                id=int(q["id"]),
+                text=q["text"],
+                role=role,
+                competency=q.get("competency", ""),
+            )
+            for q in data["questions"]
+        )
+    return QuestionBank(titles, questions)
+
+
+@lru_cache(maxsize=1)
+def get_question_bank() -> QuestionBank:
+    """Every question bank in ``QUESTION_BANK_DIR``, loaded once per process."""
+    return load_question_bank(Path(settings.QUESTION_BANK_DIR))
+
+
+QUESTION_BANK: tuple[QuestionSpec, ...] = get_question_bank().for_role(
+    settings.INTERVIEW_ROLE
+)
+
+# Display name of the configured role, used in page headings and the
+# evaluation rubric.
+ROLE_TITLE: str = get_question_bank().titles[settings.INTERVIEW_ROLE]
+
+QUESTIONS_BY_ID = get_question_bank().by_id
+
+DEFAULT_QUESTION_ORDER: tuple[int, ...] = tuple(q.id for q in QUESTION_BANK)
@@ -0,0 +1,35 @@
+"""Interview report assembly and chunked JSON serialization."""
+
+import json
+from typing import Any, Iterator, Mapping
+
+from app.blobstore import BlobStore
+
+REPORTS_DIR = "reports"
+
+_encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def build_report(
+    questions: list, answers: Mapping, evaluations: Mapping, summary: Mapping
+) -> dict[str, Any]:
+    return {
+        "questions": questions,
+        "answers": answers,
+        "evaluations": evaluations,
+        "summary": summary,
+    }
+
+
+def iter_report_json(report: Mapping[str, Any]) -> Iterator[str]:
+    """Encode ``report`` piecewise so large reports never exist as one string."""
+    return _encoder.iterencode(report)
+
+
+def report_filename(report_id: str, version: int) -> str:
+    return f"{report_id}-v{version}.json"
+
+
+def write_report(store: BlobStore, name: str, report: Mapping[str, Any]):
+    """Stream ``report`` into ``store`` as ``name``, replacing it atomically."""
+    store.put(name, (chunk.encode("utf-8") for chunk in iter_report_json(report)))
@@ -1,14 +1,48 @@
 import reflex as rx
-from app.state import InterviewState, Evaluation
+from app.state import InterviewState, ResultCard
 
 
-def question_result_card(
-    question: dict, answer: str, evaluation: Evaluation
-) -> rx.Component:
-    score_data = evaluation["scores"]
+def score_radar(card: ResultCard, with_cohort: bool) -> rx.Component:
+    series = [
+        rx.recharts.radar(
+            name="You",
+            data_key="score",
+            stroke="#f97316",
+            fill="#f97316",
+            fill_opacity=0.6,
+        )
+    ]
+    if with_cohort:
+        series.insert(
+            0,
+            rx.recharts.radar(
+                name="All candidates",
+                data_key="cohort",
+                stroke="#6b7280",
+                fill="#9ca3af",
+                fill_opacity=0.25,
+            ),
+        )
+        series.append(rx.recharts.legend())
+    return rx.recharts.radar_chart(
+        rx.recharts.polar_grid(),
+        rx.recharts.polar_angle_axis(data_key="subject", tick={"fill": "#4b5563"}),
+        # A fixed 0-5 scale so both series are drawn against the same axis.
+        rx.recharts.polar_radius_axis(domain=[0, 5], tick=False, axis_line=False),
+        *series,
+        data=card["chart"],
+        cx="50%",
+        cy="50%",
+        outer_radius="80%",
+        width=300,
+        height=250,
+    )
+
+
+def question_result_card(card: ResultCard) -> rx.Component:
     return rx.el.div(
         rx.el.h3(
-            f"Q{question['id']}: {question['text']}",
+            card["title"],
             class_name="text-lg font-semibold text-gray-800 mb-4",
         ),
         rx.el.div(
@@ -16,42 +50,22 @@ def question_result_card(
                 rx.el.h4(
                     "Your Answer", class_name="text-md font-semibold text-gray-600 mb-2"
                 ),
-                rx.el.p(answer, class_name="text-gray-700 italic"),
+                rx.el.p(card["answer"], class_name="text-gray-700 italic"),
                 class_name="mb-6",
             ),
             rx.el.div(
                 rx.el.h4(
                     "AI Feedback", class_name="text-md font-semibold text-gray-600 mb-2"
                 ),
-                rx.el.p(evaluation["feedback"], class_name="text-gray-700"),
+                rx.el.p(card["feedback"], class_name="text-gray-700"),
             ),
             class_name="p-4 bg-gray-50 rounded-lg border border-gray-200",
         ),
         rx.el.div(
-            rx.recharts.radar_chart(
-                rx.recharts.polar_grid(),
-                rx.recharts.polar_angle_axis(
-                    data_key="subject", tick={"fill": "#4b5563"}
-                ),
-                rx.recharts.radar(
-                    name="Score",
-                    data_key="score",
-                    stroke="#f97316",
-                    fill="#f97316",
-                    fill_opacity=0.6,
-                ),
-                data=[
-                    {"subject": "Relevance", "score": score_data["relevance"]},
-                    {"subject": "Impact", "score": score_data["impact"]},
-                    {"subject": "Strategy", "score": score_data["strategy"]},
-                    {"subject": "Clarity", "score": score_data["clarity"]},
-                    {"subject": "Communication", "score": score_data["communication"]},
-                ],
-                cx="50%",
-                cy="50%",
-                outer_radius="80%",
-                width=300,
-                height=250,
+            rx.cond(
+                InterviewState.has_cohort,
+                score_radar(card, with_cohort=True),
+                score_radar(card, with_cohort=False),
             ),
             class_name="flex justify-center mt-4",
         ),
@@ -76,10 +90,7 @@ def results_page() -> rx.Component:
                     rx.el.button(
                         "Download Report",
                         rx.icon("download", class_name="mr-2"),
-                        on_click=rx.download(
-                            data=InterviewState.get_report_data,
-                            filename="interview_report.json",
-                        ),
+                        on_click=InterviewState.download_report,
                         class_name="mt-4 px-4 py-2 bg-orange-500 text-white font-semibold rounded-lg shadow-sm hover:bg-orange-600 flex items-center",
                     ),
                     class_name="text-center py-12 bg-gray-50 border-b border-gray-200",
@@ -116,18 +127,7 @@ def results_page() -> rx.Component:
                             "Per-Question Analysis",
                             class_name="text-2xl font-bold text-gray-800 mb-6",
                         ),
-                        rx.foreach(
-                            InterviewState.questions,
-                            lambda q: rx.cond(
-                                InterviewState.evaluations.contains(q["id"]),
-                                question_result_card(
-                                    q,
-                                    InterviewState.answers[q["id"]],
-                                    InterviewState.evaluations[q["id"]],
-                                ),
-                                rx.el.div(),
-                            ),
-                        ),
+                        rx.foreach(InterviewState.result_cards, question_result_card),
                         class_name="space-y-8",
                     ),
                     class_name="max-w-4xl mx-auto p-8",
@@ -139,5 +139,5 @@ def results_page() -> rx.Component:
                 class_name="flex flex-col items-center justify-center h-screen",
             ),
         ),
-        class_name="font-['Inter'] bg-white min-h-screen",
+        class_name="font-sans bg-white min-h-screen",
     )
\ No newline at end of file
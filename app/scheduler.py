@@ -0,0 +1,354 @@
+"""Shared limits, retries and coalescing for requests to external APIs.
+
+Every call to ElevenLabs or an evaluation model goes through the worker's
+``Provider`` for that service, which
+
+- paces requests with a token bucket and bounds how many run at once,
+- retries throttled (429) and transient server or network failures with
+  jittered exponential backoff,
+- opens a circuit breaker after repeated server failures, timeouts or
+  cancelled calls, so callers fail fast (and evaluations fall back to the
+  local engine) instead of piling up,
+- coalesces concurrent calls that share a key into a single request.
+
+``call`` is for blocking code running in worker threads and ``call_async``
+for coroutines. The concurrency bound applies to each of the two separately.
+"""
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from app import metrics, settings
+
+T = TypeVar("T")
+
+ELEVENLABS = "elevenlabs"
+GEMINI = "gemini"
+ANTHROPIC = "anthropic"
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """``THROTTLED``, ``TRANSIENT`` or None for errors not worth retrying."""
+    status = None
+    for attr in ("status_code", "code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            status = value
+            break
+    if status == 429:
+        return THROTTLED
+    if status in RETRYABLE_STATUS:
+        return TRANSIENT
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    # SDK network errors (httpx, aiohttp, requests) without a common base.
+    if type(error).__name__.endswith(("Timeout", "ConnectError", "ConnectionError")):
+        return TRANSIENT
+    return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def drain(self):
+        """Drop any saved-up burst after the provider reports we are over quota."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures, for ``reset_seconds``.
+
+    Once that time has passed a single trial call is let through; its
+    outcome closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_seconds: float):
+        self.name = name
+        self.threshold = max(threshold, 1)
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> bool:
+        """Raise if the circuit is open; returns whether this call is the trial."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_seconds or self._trial_running:
+                raise CircuitOpenError(
+                    f"{self.name} circuit is open after {self._failures} failures"
+                )
+            self._trial_running = True
+            return True
+
+    def release_trial(self):
+        """Let another trial through after one ended before calling out."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+        metrics.API_CIRCUIT_OPEN.set(0, provider=self.name)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+            opened = self._opened_at is not None
+        metrics.API_CIRCUIT_OPEN.set(int(opened), provider=self.name)
+
+
+class Provider:
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        max_retries: int = settings.API_MAX_RETRIES,
+    ):
+        self.name = name
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(
+            name, settings.API_CIRCUIT_FAILURES, settings.API_CIRCUIT_RESET_SECONDS
+        )
+        self._thread_slots = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._async_slots = asyncio.Semaphore(max(max_concurrency, 1))
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, Future] = {}
+        self._pending_async: dict[Hashable, list] = {}
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(
+            settings.API_BACKOFF_MAX_SECONDS,
+            settings.API_BACKOFF_BASE_SECONDS * 2**attempt,
+        )
+        return random.uniform(0, ceiling)
+
+    def _succeeded(self):
+        self.breaker.record_success()
+        metrics.API_REQUESTS.inc(provider=self.name, outcome="ok")
+
+    def _failed(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; returns the delay before retrying, or None."""
+        kind = classify_error(error)
+        if kind == TRANSIENT:
+            self.breaker.record_failure()
+        else:
+            # The provider answered, so it is up even if the request failed.
+            self.breaker.record_success()
+        if kind == THROTTLED:
+            self.bucket.drain()
+        if kind is None or attempt >= self.max_retries or self.breaker.is_open:
+            metrics.API_REQUESTS.inc(provider=self.name, outcome="error")
+            return None
+        metrics.API_REQUESTS.inc(provider=self.name, outcome=kind)
+        return self._backoff(attempt)
+
+    def _interrupted(self, is_trial: bool, called: bool):
+        """Record an attempt ended by cancellation, a timeout or an interrupt.
+
+        Once the request was sent this counts as a failure, because a provider
+        that hangs is what the breaker is for. Either way a trial is released,
+        so the circuit can never stay open for good.
+        """
+        if called:
+            self.breaker.record_failure()
+            metrics.API_REQUESTS.inc(provider=self.name, outcome="cancelled")
+        elif is_trial:
+            self.breaker.release_trial()
+
+    def _attempts(self, fn: Callable[[], T]) -> T:
+        for attempt in itertools.count():
+            is_trial = self.breaker.before_call()
+            called = False
+            try:
+                started = time.perf_counter()
+                time.sleep(self.bucket.reserve())
+                with self._thread_slots:
+                    metrics.API_WAIT_SECONDS.observe(
+                        time.perf_counter() - started, provider=self.name
+                    )
+                    called = True
+                    result = fn()
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._interrupted(is_trial, called)
+                raise
+            else:
+                self._succeeded()
+                return result
+            time.sleep(delay)
+
+    async def _attempts_async(self, fn: Callable[[], Awaitable[T]]) -> T:
+        for attempt in itertools.count():
+            is_trial = self.breaker.before_call()
+            called = False
+            try:
+                started = time.perf_counter()
+                await asyncio.sleep(self.bucket.reserve())
+                async with self._async_slots:
+                    metrics.API_WAIT_SECONDS.observe(
+                        time.perf_counter() - started, provider=self.name
+                    )
+                    called = True
+                    result = await fn()
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._interrupted(is_trial, called)
+                raise
+            else:
+                self._succeeded()
+                return result
+            await asyncio.sleep(delay)
+
+    def call(self, fn: Callable[[], T], key: Optional[Hashable] = None) -> T:
+        """Run blocking ``fn`` under this provider's limits, retrying failures.
+
+        Concurrent calls with the same ``key`` share one run of ``fn``.
+        """
+        if key is None:
+            return self._attempts(fn)
+        with self._lock:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = self._pending[key] = Future()
+        if not leader:
+            metrics.API_REQUESTS.inc(provider=self.name, outcome="coalesced")
+            return future.result()
+        try:
+            result = self._attempts(fn)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._pending[key]
+
+    async def call_async(
+        self, fn: Callable[[], Awaitable[T]], key: Optional[Hashable] = None
+    ) -> T:
+        """Await ``fn()`` under this provider's limits, retrying failures.
+
+        Concurrent calls with the same ``key`` share one request, which is
+        cancelled only when every caller waiting on it has been cancelled.
+        """
+        if key is None:
+            return await self._attempts_async(fn)
+        entry = self._pending_async.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._attempts_async(fn))
+            entry = self._pending_async[key] = [task, 0]
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            metrics.API_REQUESTS.inc(provider=self.name, outcome="coalesced")
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        entry = self._pending_async.get(key)
+        if entry is not None and entry[0] is task:
+            del self._pending_async[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller has gone away.
+            task.exception()
+
+
+def _limits(name: str) -> tuple[float, int, int]:
+    """Requests per second, burst size and concurrency for ``name``."""
+    if name == ELEVENLABS:
+        return (
+            settings.ELEVENLABS_REQUESTS_PER_SECOND,
+            settings.ELEVENLABS_BURST,
+            settings.TTS_MAX_CONCURRENCY,
+        )
+    if name == GEMINI:
+        rate = settings.GEMINI_REQUESTS_PER_SECOND
+    elif name == ANTHROPIC:
+        rate = settings.ANTHROPIC_REQUESTS_PER_SECOND
+    else:
+        raise ValueError(f"Unknown API provider {name!r}")
+    return rate, settings.LLM_BURST, settings.EVALUATOR_MAX_CONCURRENCY
+
+
+@lru_cache(maxsize=None)
+def get_provider(name: str) -> Provider:
+    """The process-wide scheduler for one external API."""
+    return Provider(name, *_limits(name))
+
+
+def call(
+    provider: str, fn: Callable[[], T], key: Optional[Hashable] = None
+) -> T:
+    return get_provider(provider).call(fn, key)
+
+
+async def call_async(
+    provider: str, fn: Callable[[], Awaitable[T]], key: Optional[Hashable] = None
+) -> T:
+    return await get_provider(provider).call_async(fn, key)
@@ -0,0 +1,76 @@
+"""Local aggregation of per-question evaluations into the interview summary."""
+
+from typing import Mapping
+
+SCORE_DIMENSIONS = ("relevance", "impact", "strategy", "clarity", "communication")
+
+DIMENSION_LABELS = {
+    "relevance": "Relevance",
+    "impact": "Impact/Results",
+    "strategy": "Strategy/Approach",
+    "clarity": "Clarity & Structure",
+    "communication": "Communication & Confidence",
+}
+
+
+def question_average(scores: Mapping[str, float]) -> float:
+    return sum(float(scores.get(d, 0)) for d in SCORE_DIMENSIONS) / len(
+        SCORE_DIMENSIONS
+    )
+
+
+def aggregate_scores(evaluations: Mapping[int, dict]) -> dict:
+    """Per-dimension means, the overall average and best/worst dimensions."""
+    if not evaluations:
+        return {
+            "evaluated": 0,
+            "dimension_averages": {d: 0.0 for d in SCORE_DIMENSIONS},
+            "total_average": 0.0,
+            "best_dimension": None,
+            "worst_dimension": None,
+        }
+    totals = {d: 0.0 for d in SCORE_DIMENSIONS}
+    for evaluation in evaluations.values():
+        for d in SCORE_DIMENSIONS:
+            totals[d] += float(evaluation["scores"].get(d, 0))
+    count = len(evaluations)
+    averages = {d: round(totals[d] / count, 2) for d in SCORE_DIMENSIONS}
+    return {
+        "evaluated": count,
+        "dimension_averages": averages,
+        "total_average": round(sum(totals.values()) / (count * len(totals)), 2),
+        "best_dimension": max(SCORE_DIMENSIONS, key=averages.__getitem__),
+        "worst_dimension": min(SCORE_DIMENSIONS, key=averages.__getitem__),
+    }
+
+
+def build_summary(evaluations: Mapping[int, dict]) -> dict:
+    """The ``overall_summary`` for the evaluations collected so far.
+
+    Cheap enough to rebuild after every evaluated answer, so the report is
+    ready as soon as the last answer is scored.
+    """
+    aggregates = aggregate_scores(evaluations)
+    if not evaluations:
+        return {**aggregates, "summary": "No answers were evaluated."}
+    best = aggregates["best_dimension"]
+    worst = aggregates["worst_dimension"]
+    averages = aggregates["dimension_averages"]
+    ranked = sorted(
+        evaluations.items(), key=lambda item: question_average(item[1]["scores"])
+    )
+    strongest_id, strongest = ranked[-1]
+    weakest_id, weakest = ranked[0]
+    evaluated = aggregates["evaluated"]
+    answers = "answer" if evaluated == 1 else "answers"
+    sentences = [
+        f"Across {evaluated} evaluated {answers} the candidate averaged "
+        f"{aggregates['total_average']:.1f} out of 5.",
+        f"Their strongest area was {DIMENSION_LABELS[best]} ({averages[best]:.1f}) "
+        f"and the main area for improvement is {DIMENSION_LABELS[worst]} "
+        f"({averages[worst]:.1f}).",
+        f"Best answer (Q{strongest_id}): {strongest['feedback']}",
+    ]
+    if weakest_id != strongest_id:
+        sentences.append(f"Weakest answer (Q{weakest_id}): {weakest['feedback']}")
+    return {**aggregates, "summary": " ".join(sentences)}
@@ -0,0 +1,281 @@
+"""Durable, append-only log of interview progress backed by SQLite.
+
+Event handlers call ``append`` which only enqueues; a writer thread commits
+queued events in batches, so handlers never wait on disk. Reads replay a
+session's events into a ``SessionSnapshot`` for resuming.
+
+The ``finished`` event of an interview carries its score totals, which the
+writer also keeps in ``session_scores``. Cohort statistics are then a single
+SQL aggregate instead of a replay of every session.
+
+Creating the store opens the database and creates its schema, so the first
+``get_session_store()`` call should happen in a thread; the warm-up task and
+``InterviewState.resume_interview`` take care of that.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from app import settings
+from app.scoring import SCORE_DIMENSIONS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    question_id INTEGER,
+    payload TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, id);
+-- One row per finished interview; each dimension column is the sum of that
+-- score over the interview's answers.
+CREATE TABLE IF NOT EXISTS session_scores (
+    session_id TEXT PRIMARY KEY,
+    answers INTEGER NOT NULL,
+    relevance REAL NOT NULL,
+    impact REAL NOT NULL,
+    strategy REAL NOT NULL,
+    clarity REAL NOT NULL,
+    communication REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+# Bumped with schema changes that need existing data migrated.
+SCHEMA_VERSION = 1
+
+_INSERT_SCORES = (
+    "INSERT OR REPLACE INTO session_scores "
+    f"(session_id, answers, {', '.join(SCORE_DIMENSIONS)}, finished_at) "
+    f"VALUES ({', '.join('?' * (len(SCORE_DIMENSIONS) + 3))})"
+)
+
+STARTED = "started"
+ANSWER = "answer"
+EVALUATION = "evaluation"
+CURSOR = "cursor"
+FINISHED = "finished"
+
+
+@dataclass
+class SessionSnapshot:
+    session_id: str
+    started: bool = False
+    finished: bool = False
+    question_order: list[int] = field(default_factory=list)
+    current_question_index: int = 0
+    answers: dict[int, str] = field(default_factory=dict)
+    evaluations: dict[int, dict] = field(default_factory=dict)
+
+
+def score_summary(evaluations: Mapping[int, dict]) -> dict:
+    """Payload of a ``finished`` event: answer count and score sums."""
+    return {
+        "answers": len(evaluations),
+        "score_sums": {
+            d: sum(float(e["scores"].get(d, 0)) for e in evaluations.values())
+            for d in SCORE_DIMENSIONS
+        },
+    }
+
+
+def _score_row(session_id: str, summary: Mapping, finished_at: float) -> tuple:
+    sums = summary["score_sums"]
+    return (
+        session_id,
+        summary["answers"],
+        *(float(sums.get(d, 0)) for d in SCORE_DIMENSIONS),
+        finished_at,
+    )
+
+
+def _migrate(conn: sqlite3.Connection):
+    """Fill ``session_scores`` for interviews finished before it existed."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    rows = conn.execute(
+        "SELECT session_id, kind, question_id, payload FROM events "
+        "ORDER BY session_id, id"
+    )
+    scores = [
+        _score_row(s.session_id, score_summary(s.evaluations), time.time())
+        for s in _replay(rows)
+        if s.finished and s.evaluations
+    ]
+    with conn:
+        conn.executemany(_INSERT_SCORES, scores)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SessionStore:
+    def __init__(self, path: str, flush_seconds: float, batch_size: int):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._reader_local = threading.local()
+        with contextlib.closing(_connect(path)) as conn:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+        self._writer = threading.Thread(
+            target=self._write_loop, name="session-store-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def append(
+        self,
+        session_id: str,
+        kind: str,
+        question_id: Optional[int] = None,
+        payload: Any = None,
+    ):
+        """Queue an event for ``session_id``; returns immediately."""
+        self._queue.put(
+            (session_id, kind, question_id, json.dumps(payload), time.time())
+        )
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            stop = None in batch
+            rows = _coalesce([row for row in batch if row is not None])
+            scores = [
+                _score_row(session_id, json.loads(payload), created_at)
+                for session_id, kind, _, payload, created_at in rows
+                if kind == FINISHED and payload != "null"
+            ]
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO events "
+                        "(session_id, kind, question_id, payload, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.executemany(_INSERT_SCORES, scores)
+            except sqlite3.Error as e:
+                logging.exception(f"Failed to persist {len(rows)} session events: {e}")
+            if stop:
+                conn.close()
+                return
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._reader_local, "conn", None)
+        if conn is None:
+            conn = self._reader_local.conn = _connect(self.path)
+        return conn
+
+    def load(self, session_id: str) -> Optional[SessionSnapshot]:
+        """Replay the events of ``session_id``. Blocking; run it in a thread."""
+        rows = self._reader().execute(
+            "SELECT session_id, kind, question_id, payload FROM events "
+            "WHERE session_id = ? ORDER BY id",
+            (session_id,),
+        )
+        return next(_replay(rows), None)
+
+    def cohort_score_sums(self) -> tuple[int, dict[str, float]]:
+        """Answer count and per-dimension score sums over finished interviews."""
+        columns = ", ".join(f"COALESCE(SUM({d}), 0)" for d in SCORE_DIMENSIONS)
+        answers, *sums = (
+            self._reader()
+            .execute(f"SELECT COALESCE(SUM(answers), 0), {columns} FROM session_scores")
+            .fetchone()
+        )
+        return answers, dict(zip(SCORE_DIMENSIONS, sums))
+
+    def iter_sessions(self) -> Iterator[SessionSnapshot]:
+        """Replay every session, one at a time, in a single ordered scan."""
+        rows = self._reader().execute(
+            "SELECT session_id, kind, question_id, payload FROM events "
+            "ORDER BY session_id, id"
+        )
+        return _replay(rows)
+
+
+def _replay(rows: Iterable[tuple]) -> Iterator[SessionSnapshot]:
+    """Fold rows ordered by session into snapshots, yielding each when done."""
+    snapshot = None
+    for session_id, kind, question_id, payload in rows:
+        if snapshot is None or snapshot.session_id != session_id:
+            if snapshot is not None:
+                yield snapshot
+            snapshot = SessionSnapshot(session_id)
+        value = json.loads(payload)
+        if kind == STARTED:
+            snapshot.started = True
+            snapshot.finished = False
+            snapshot.question_order = value
+            snapshot.current_question_index = 0
+        elif kind == ANSWER:
+            snapshot.answers[question_id] = value
+        elif kind == EVALUATION:
+            snapshot.evaluations[question_id] = value
+        elif kind == CURSOR:
+            snapshot.current_question_index = value
+        elif kind == FINISHED:
+            snapshot.finished = True
+    if snapshot is not None:
+        yield snapshot
+
+
+def _coalesce(rows: list[tuple]) -> list[tuple]:
+    """Keep only the latest answer per session and question within a batch.
+
+    Transcript syncs rewrite the answer several times a second; intermediate
+    versions are never read back, so they are not worth a row each.
+    """
+    latest_answer = {}
+    for i, (session_id, kind, question_id, _, _) in enumerate(rows):
+        if kind == ANSWER:
+            latest_answer[(session_id, question_id)] = i
+    return [
+        row
+        for i, row in enumerate(rows)
+        if row[1] != ANSWER or latest_answer[(row[0], row[2])] == i
+    ]
+
+
+@lru_cache(maxsize=1)
+def get_session_store() -> Optional[SessionStore]:
+    """The process-wide session store, or None if persistence is disabled."""
+    if not settings.SESSION_STORE_PATH:
+        return None
+    return SessionStore(
+        settings.SESSION_STORE_PATH,
+        settings.SESSION_STORE_FLUSH_SECONDS,
+        settings.SESSION_STORE_BATCH_SIZE,
+    )
@@ -0,0 +1,122 @@
+"""Deployment settings read from the environment once at import."""
+
+import os
+
+TTS_VOICE_ID = os.getenv("TTS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
+TTS_MODEL_ID = os.getenv("TTS_MODEL_ID", "eleven_multilingual_v2")
+TTS_OUTPUT_FORMAT = os.getenv("TTS_OUTPUT_FORMAT", "mp3_44100_128")
+# Low-bitrate speech variant served to clients on slow or metered links
+# (Save-Data, or the ECT/Downlink the page reports), chosen once per
+# session; empty disables it.
+TTS_LITE_OUTPUT_FORMAT = os.getenv("TTS_LITE_OUTPUT_FORMAT", "mp3_22050_32")
+AUDIO_LITE_MAX_DOWNLINK_MBPS = float(os.getenv("AUDIO_LITE_MAX_DOWNLINK_MBPS", "1.5"))
+
+# Shared storage for audio, reports and evaluation cache entries: "local"
+# (a directory, mount it on every host) or "object" (S3-compatible bucket, or
+# a directory stand-in when no bucket is set). See docs/deployment.md.
+BLOB_STORE = os.getenv("BLOB_STORE", "local")
+# Defaults to the Reflex upload dir.
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "")
+BLOB_STORE_BUCKET = os.getenv("BLOB_STORE_BUCKET", "")
+
+# Namespace of the audio cache within the blob store.
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", "tts_cache")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "3"))
+TTS_PREFETCH_QUESTIONS = int(os.getenv("TTS_PREFETCH_QUESTIONS", "2"))
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+EVAL_CACHE_MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "4096"))
+EVAL_CACHE_TTL_SECONDS = float(os.getenv("EVAL_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+# Blob store namespace that persists evaluations across restarts and shares
+# them between workers; unset keeps the cache in memory only.
+EVAL_CACHE_DIR = os.getenv("EVAL_CACHE_DIR")
+
+TRANSCRIPT_SYNC_INTERVAL_MS = int(os.getenv("TRANSCRIPT_SYNC_INTERVAL_MS", "750"))
+TRANSCRIPT_SYNC_MODE = os.getenv("TRANSCRIPT_SYNC_MODE", "interim")
+
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-5-haiku-latest")
+
+# One of "gemini", "anthropic" or "local".
+EVALUATOR_BACKEND = os.getenv("EVALUATOR_BACKEND", "gemini")
+# Remote evaluations slower than this fall back to the local rubric engine;
+# a streamed one only needs its scores within this time.
+EVALUATOR_TIMEOUT_SECONDS = float(os.getenv("EVALUATOR_TIMEOUT_SECONDS", "30"))
+EVALUATOR_LOCAL_FALLBACK = os.getenv("EVALUATOR_LOCAL_FALLBACK", "1") == "1"
+# Stream evaluations: scores are shown as soon as they are generated and the
+# feedback text follows as it arrives.
+EVALUATION_STREAMING = os.getenv("EVALUATION_STREAMING", "1") == "1"
+# Answers estimated above this many tokens are trimmed before evaluation.
+EVALUATION_ANSWER_TOKEN_BUDGET = int(
+    os.getenv("EVALUATION_ANSWER_TOKEN_BUDGET", "1000")
+)
+# Start evaluating the live transcript before recording stops, once the
+# candidate pauses for this long or the answer grows by this many words (0
+# turns the word trigger off). Off by default: each speculation is a full
+# remote evaluation, and superseded ones may still be billed by the provider,
+# so an answer can cost several model calls instead of one.
+SPECULATIVE_EVALUATION = os.getenv("SPECULATIVE_EVALUATION", "0") == "1"
+SPECULATIVE_PAUSE_MS = int(os.getenv("SPECULATIVE_PAUSE_MS", "1500"))
+SPECULATIVE_MIN_WORDS = int(os.getenv("SPECULATIVE_MIN_WORDS", "40"))
+
+# Voice activity detection in speech.js: stop recording and evaluate once the
+# candidate has spoken for VAD_MIN_SPEECH_MS and then been silent for
+# VAD_SILENCE_MS. Speech is microphone input louder than VAD_THRESHOLD_DB
+# (dBFS). Opt-in: candidates often pause to think for longer than
+# VAD_SILENCE_MS, and would have an unfinished answer scored.
+VAD_ENABLED = os.getenv("VAD_ENABLED", "0") == "1"
+VAD_SILENCE_MS = int(os.getenv("VAD_SILENCE_MS", "2500"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "1500"))
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-50"))
+
+# Outbound API scheduling (see app/scheduler.py). Rates are requests per
+# second per worker; 0 disables the rate limit.
+ELEVENLABS_REQUESTS_PER_SECOND = float(
+    os.getenv("ELEVENLABS_REQUESTS_PER_SECOND", "2")
+)
+ELEVENLABS_BURST = int(os.getenv("ELEVENLABS_BURST", "5"))
+GEMINI_REQUESTS_PER_SECOND = float(os.getenv("GEMINI_REQUESTS_PER_SECOND", "5"))
+ANTHROPIC_REQUESTS_PER_SECOND = float(
+    os.getenv("ANTHROPIC_REQUESTS_PER_SECOND", "5")
+)
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+EVALUATOR_MAX_CONCURRENCY = int(os.getenv("EVALUATOR_MAX_CONCURRENCY", "16"))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "4"))
+API_BACKOFF_BASE_SECONDS = float(os.getenv("API_BACKOFF_BASE_SECONDS", "0.5"))
+API_BACKOFF_MAX_SECONDS = float(os.getenv("API_BACKOFF_MAX_SECONDS", "10"))
+API_CIRCUIT_FAILURES = int(os.getenv("API_CIRCUIT_FAILURES", "5"))
+API_CIRCUIT_RESET_SECONDS = float(os.getenv("API_CIRCUIT_RESET_SECONDS", "30"))
+
+# Workers in the job pool that runs evaluations and TTS off the web event
+# loop (see app/jobs.py). Evaluations get JOB_WORKERS; TTS prefetch and
+# warm-up share the separate JOB_BACKGROUND_WORKERS.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_BACKGROUND_WORKERS = int(os.getenv("JOB_BACKGROUND_WORKERS", "3"))
+
+# Import provider SDKs, open their connections and check the audio cache in
+# the background at boot, so the first interview does not pay for it.
+WARMUP_ON_BOOT = os.getenv("WARMUP_ON_BOOT", "1") == "1"
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Serializing every update just to measure it would double the cost, so
+# only every Nth state update is sized.
+METRICS_DELTA_SAMPLE_EVERY = int(os.getenv("METRICS_DELTA_SAMPLE_EVERY", "10"))
+
+QUESTION_BANK_DIR = os.getenv(
+    "QUESTION_BANK_DIR", os.path.join(os.path.dirname(__file__), "question_banks")
+)
+INTERVIEW_ROLE = os.getenv("INTERVIEW_ROLE", "sales_bd")
+
+# SQLite file for resumable sessions; set to an empty string to disable.
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "interview_sessions.db")
+SESSION_STORE_FLUSH_SECONDS = float(os.getenv("SESSION_STORE_FLUSH_SECONDS", "0.5"))
+SESSION_STORE_BATCH_SIZE = int(os.getenv("SESSION_STORE_BATCH_SIZE", "500"))
+# How long the cohort averages behind the results overlay are reused before
+# the session store is scanned again.
+COHORT_REFRESH_SECONDS = float(os.getenv("COHORT_REFRESH_SECONDS", "600"))
@@ -0,0 +1,101 @@
+"""Evaluations started on the live transcript before recording stops.
+
+Each candidate and question (the "owner") has at most one speculative
+evaluation in flight. Starting a newer one for a longer transcript cancels
+the older one. When the final evaluation is requested, ``claim`` hands back
+the speculative result if it was computed for the same text, and cancels it
+otherwise. Speculations run in the job pool below final evaluations.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from app import jobs, metrics
+from app.eval_cache import get_evaluation_cache
+from app.evaluators import Evaluator, evaluate_with_fallback
+
+# Owners that never claim (abandoned interviews) are dropped oldest first.
+MAX_OWNERS = 1024
+
+_speculations: "OrderedDict[str, tuple[str, jobs.Job]]" = OrderedDict()
+
+
+async def _run(
+    evaluator: Evaluator, cache_key: str, question_text: str, answer_text: str
+) -> tuple[Evaluator, dict]:
+    cache = get_evaluation_cache()
+    # Another worker may have stored it; checked here, off the Reflex loop.
+    cached = await cache.get_async(cache_key)
+    if cached is not None:
+        return evaluator, cached
+    used_evaluator, evaluation = await evaluate_with_fallback(
+        evaluator, question_text, answer_text
+    )
+    if used_evaluator is evaluator:
+        await cache.put_async(cache_key, evaluation)
+    return used_evaluator, evaluation
+
+
+def _discard(owner: str, cancel: bool):
+    _, job = _speculations.pop(owner)
+    if cancel and not job.future.done():
+        job.cancel()
+        metrics.EVALUATION_SPECULATIONS.inc(result="cancelled")
+
+
+def speculate(
+    owner: str,
+    evaluator: Evaluator,
+    cache_key: str,
+    question_text: str,
+    answer_text: str,
+):
+    """Start evaluating ``answer_text`` in the background unless already known."""
+    current = _speculations.get(owner)
+    if current is not None and current[0] == cache_key:
+        return
+    if get_evaluation_cache().peek(cache_key) is not None:
+        return
+    if current is not None:
+        _discard(owner, cancel=True)
+    while len(_speculations) >= MAX_OWNERS:
+        _discard(next(iter(_speculations)), cancel=True)
+    job = jobs.submit(
+        jobs.SPECULATE, _run, evaluator, cache_key, question_text, answer_text
+    )
+    _speculations[owner] = (cache_key, job)
+    metrics.EVALUATION_SPECULATIONS.inc(result="started")
+
+
+async def claim(owner: str, cache_key: str) -> Optional[tuple[Evaluator, dict]]:
+    """The speculative result for ``cache_key``, or None if there is none.
+
+    Waits for a matching speculation that is still running; a speculation
+    for different text is cancelled.
+    """
+    current = _speculations.get(owner)
+    if current is None:
+        return None
+    if current[0] != cache_key:
+        _discard(owner, cancel=True)
+        return None
+    _discard(owner, cancel=False)
+    job = current[1]
+    try:
+        result = await job.wait()
+    except asyncio.CancelledError:
+        if not job.future.done():
+            raise
+        return None
+    except Exception as e:
+        logging.warning(f"Speculative evaluation failed: {e!r}")
+        return None
+    metrics.EVALUATION_SPECULATIONS.inc(result="reused")
+    return result
+
+
+def cancel(owner: str):
+    if owner in _speculations:
+        _discard(owner, cancel=True)
@@ -1,11 +1,62 @@
 import reflex as rx
-import google.generativeai as genai
+from reflex.utils.format import format_event_handler
 from typing import TypedDict, Optional
-import os
-from elevenlabs.client import ElevenLabs
-from elevenlabs.core import ApiError
+import asyncio
 import logging
 import json
+import time
+import uuid
+from app import jobs, metrics, session_store, settings, speculation
+from app.api import audio_url, choose_audio_variant, report_download_url
+from app.blobstore import get_blob_store
+from app.eval_cache import get_evaluation_cache, make_evaluation_key
+from app.evaluators import (
+    Evaluator,
+    evaluate_with_fallback,
+    get_evaluator,
+    is_cut_short,
+    stream_with_fallback,
+)
+from app.questions import DEFAULT_QUESTION_ORDER, QUESTIONS_BY_ID, get_question_bank
+from app.report import REPORTS_DIR, build_report, report_filename, write_report
+from app.scoring import DIMENSION_LABELS, build_summary
+from app.session_store import get_session_store, score_summary
+from app.tts import (
+    STANDARD,
+    cached_question_audio,
+    get_elevenlabs_client,
+    question_audio_key,
+    register_question_stream,
+    synthesize_question_audio_async,
+)
+
+for _question in get_question_bank():
+    register_question_stream(_question.id, _question.text)
+
+# Evaluated by call_script inside Reflex's event loop, where the event queue
+# helpers are in scope; lets speech.js queue backend events by handler name.
+REFLEX_DISPATCH_JS = "((name, payload) => queueEvents([ReflexEvent(name, payload)], { current: socket }, false, navigate, params))"
+
+# The Save-Data, ECT and Downlink client hints as the page sees them. The
+# audio endpoint is on the API origin, which browsers do not send these
+# hints to, so the page reports them and the session picks its variant.
+CONNECTION_HINTS_JS = "(() => { const c = navigator.connection || {}; return {'save-data': c.saveData ? 'on' : '', ect: c.effectiveType || '', downlink: c.downlink == null ? '' : String(c.downlink)}; })()"
+
+
+def _stream_audio_url(text: str, variant: str) -> str:
+    """A question's audio URL if TTS can stream it; needs no cache lookup."""
+    if not get_elevenlabs_client():
+        return ""
+    return audio_url(question_audio_key(text, variant))
+
+
+def _cached_question_ids(question_ids: list[int], variant: str) -> set[int]:
+    """The questions whose audio is cached; blocks on the blob store."""
+    return {
+        qid
+        for qid in question_ids
+        if cached_question_audio(QUESTIONS_BY_ID[qid].text, variant) is not None
+    }
 
 
 class Question(TypedDict):
@@ -28,46 +79,55 @@ class Evaluation(TypedDict):
     overall: float
 
 
+class ChartPoint(TypedDict):
+    subject: str
+    score: float
+    cohort: float
+
+
+class ResultCard(TypedDict):
+    id: int
+    title: str
+    answer: str
+    feedback: str
+    chart: list[ChartPoint]
+
+
+def _result_cards(
+    question_order: list[int],
+    answers: dict[int, str],
+    evaluations: dict[int, Evaluation],
+    cohort_averages: dict[str, float],
+) -> list[ResultCard]:
+    cards = []
+    for qid in question_order:
+        evaluation = evaluations.get(qid)
+        if evaluation is None:
+            continue
+        scores = evaluation["scores"]
+        cards.append(
+            {
+                "id": qid,
+                "title": f"Q{qid}: {QUESTIONS_BY_ID[qid].text}",
+                "answer": answers.get(qid, ""),
+                "feedback": evaluation["feedback"],
+                "chart": [
+                    {
+                        "subject": label,
+                        "score": scores.get(d, 0),
+                        "cohort": cohort_averages.get(d, 0.0),
+                    }
+                    for d, label in DIMENSION_LABELS.items()
+                ],
+            }
+        )
+    return cards
+
+
 class InterviewState(rx.State):
     """Manages the state of the AI interview session."""
 
-    questions: list[Question] = [
-        {
-            "id": 1,
-            "text": "Tell me about your most successful sales campaign — what made it effective?",
-            "audio_file": None,
-        },
-        {
-            "id": 2,
-            "text": "Describe a time you had to handle a difficult client. What was the situation and how did you manage it?",
-            "audio_file": None,
-        },
-        {
-            "id": 3,
-            "text": "How do you identify and qualify potential leads? What tools or strategies do you use?",
-            "audio_file": None,
-        },
-        {
-            "id": 4,
-            "text": "Walk me through your process for closing a complex, high-value deal from start to finish.",
-            "audio_file": None,
-        },
-        {
-            "id": 5,
-            "text": "How do you stay updated on industry trends and competitor activities, and how do you use that information?",
-            "audio_file": None,
-        },
-        {
-            "id": 6,
-            "text": "Describe a situation where you failed to meet a sales target. What did you learn from that experience?",
-            "audio_file": None,
-        },
-        {
-            "id": 7,
-            "text": "Imagine you need to break into a new, untapped market. What would be your 90-day plan?",
-            "audio_file": None,
-        },
-    ]
+    question_order: list[int] = list(DEFAULT_QUESTION_ORDER)
     answers: dict[int, str] = {}
     evaluations: dict[int, Evaluation] = {}
     overall_summary: dict = {}
@@ -77,11 +137,46 @@ class InterviewState(rx.State):
     interview_finished: bool = False
     is_recording: bool = False
     transcript: str = ""
+    interim_transcript: str = ""
     is_ai_speaking: bool = False
+    # Audio URLs are resolved by generate_all_question_audio, off the event
+    # loop, because a cache lookup can be a blob store round trip.
+    current_audio_url: str = ""
+    # Only set once the audio is cached: preloading uncached audio would
+    # start a second synthesis next to the prefetch job.
+    next_audio_url: str = ""
+    # Audio variant for this session, resolved once from the client's
+    # connection hints so playback, preloads and prefetch all use it.
+    _audio_variant: str = ""
+    interview_session_id: str = rx.Cookie(
+        "", name="interview_session_id", max_age=7 * 24 * 60 * 60, same_site="strict"
+    )
+    # Mean score per dimension across finished interviews, for the results
+    # overlay; empty until loaded or when there is no cohort yet.
+    cohort_averages: dict[str, float] = {}
+    # Everything the results page renders, one compact entry per answer. A
+    # plain var rather than a computed one, so it is only serialized when the
+    # results change instead of on every transcript update.
+    result_cards: list[ResultCard] = []
+    _report_id: str = ""
+    _report_version: int = 0
+    _report_written_version: int = -1
+    # Answer length, in words, when the last speculative evaluation started.
+    _speculated_words: int = 0
+    # The question being recorded, so the final segment reaches it even if
+    # the candidate has already moved on; -1 once that segment is applied.
+    _recording_question_id: int = -1
+
+    @rx.var
+    def questions(self) -> list[Question]:
+        return [
+            {"id": qid, "text": QUESTIONS_BY_ID[qid].text, "audio_file": None}
+            for qid in self.question_order
+        ]
 
     @rx.var
     def total_questions(self) -> int:
-        return len(self.questions)
+        return len(self.question_order)
 
     @rx.var
     def progress_percent(self) -> float:
@@ -95,7 +190,8 @@ class InterviewState(rx.State):
             self.interview_started
             and 0 <= self.current_question_index < self.total_questions
         ):
-            return self.questions[self.current_question_index]
+            spec = QUESTIONS_BY_ID[self.question_order[self.current_question_index]]
+            return {"id": spec.id, "text": spec.text, "audio_file": None}
         return None
 
     @rx.var
@@ -112,152 +208,458 @@ class InterviewState(rx.State):
     def is_last_question(self) -> bool:
         return self.current_question_index == self.total_questions - 1
 
+    def _question_id_at(self, index: int) -> Optional[int]:
+        if 0 <= index < self.total_questions:
+            return self.question_order[index]
+        return None
+
+    def _show_question_audio(self, known_url: str = ""):
+        """Point the players at the current question until its lookup finishes.
+
+        ``known_url`` is the question's cached audio URL, if already resolved.
+        """
+        question = self.current_question
+        self.current_audio_url = known_url or (
+            _stream_audio_url(question["text"], self._variant()) if question else ""
+        )
+        self.next_audio_url = ""
+
+    def _show_cached_audio(self, question_id: int):
+        text = QUESTIONS_BY_ID[question_id].text
+        url = audio_url(question_audio_key(text, self._variant()))
+        if self._question_id_at(self.current_question_index) == question_id:
+            if self.current_audio_url != url:
+                self.current_audio_url = url
+        elif self._question_id_at(self.current_question_index + 1) == question_id:
+            if self.next_audio_url != url:
+                self.next_audio_url = url
+
+    def _variant(self) -> str:
+        return self._audio_variant or STANDARD
+
+    @rx.event
+    def detect_audio_variant(self):
+        """Ask the page for its connection hints, then resume the interview."""
+        if self._audio_variant:
+            return InterviewState.resume_interview
+        return rx.call_script(
+            CONNECTION_HINTS_JS, callback=InterviewState.set_audio_variant
+        )
+
+    @rx.event
+    def set_audio_variant(self, hints: dict):
+        if not self._audio_variant:
+            self._audio_variant = choose_audio_variant(hints or {})
+        return InterviewState.resume_interview
+
     @rx.event
     def start_interview(self):
         self.interview_started = True
         self.current_question_index = 0
+        self._show_question_audio()
+        self.interview_session_id = uuid.uuid4().hex
+        self._log_session_event(session_store.STARTED, payload=self.question_order)
         return InterviewState.generate_all_question_audio
 
     @rx.event
-    async def generate_all_question_audio(self):
-        api_key = os.getenv("ELEVENLABS_API_KEY")
-        if not api_key:
-            logging.warning(
-                "ELEVENLABS_API_KEY not set. Skipping audio generation. The interview will proceed without audio."
-            )
+    async def resume_interview(self):
+        """Restore an unfinished interview recorded under the session cookie."""
+        # Runs on page load, so the store is opened here, off the event loop,
+        # before any handler appends to it.
+        store = await asyncio.to_thread(get_session_store)
+        if store is None or not self.interview_session_id or self.interview_started:
             return
-        client = ElevenLabs(api_key=api_key)
-        for i, q in enumerate(self.questions):
-            if q["audio_file"] is None:
-                try:
-                    audio_generator = client.text_to_speech.convert(
-                        text=q["text"],
-                        voice_id="JBFqnCBsd6RMkjVDRZzb",
-                        model_id="eleven_multilingual_v2",
-                        output_format="mp3_44100_128",
-                    )
-                    filename = f"question_{q['id']}.mp3"
-                    upload_dir = rx.get_upload_dir()
-                    upload_dir.mkdir(parents=True, exist_ok=True)
-                    outfile = upload_dir / filename
-                    with outfile.open("wb") as file_object:
-                        for chunk in audio_generator:
-                            file_object.write(chunk)
-                    self.questions[i]["audio_file"] = filename
-                except ApiError as e:
-                    if e.status_code == 401:
-                        logging.warning(
-                            f"ElevenLabs API key is missing text-to-speech permission for question {q['id']}. The interview will continue without audio for this question."
-                        )
-                    else:
-                        logging.exception(
-                            f"An ElevenLabs API error occurred for question {q['id']}: {e}"
-                        )
-                except Exception as e:
-                    logging.exception(
-                        f"An unexpected error occurred generating audio for question {q['id']}: {e}"
-                    )
+        snapshot = await asyncio.to_thread(store.load, self.interview_session_id)
+        if snapshot is None or not snapshot.started or snapshot.finished:
+            return
+        self.question_order = snapshot.question_order or list(DEFAULT_QUESTION_ORDER)
+        self.answers = snapshot.answers
+        self.evaluations = snapshot.evaluations
+        self.overall_summary = build_summary(self.evaluations)
+        self.current_question_index = min(
+            snapshot.current_question_index, self.total_questions - 1
+        )
+        self.transcript = self.current_answer
+        self.interview_started = True
+        self._report_version += 1
+        self._show_question_audio()
+        return InterviewState.generate_all_question_audio
+
+    def _log_session_event(
+        self, kind: str, question_id: Optional[int] = None, payload=None
+    ):
+        store = get_session_store()
+        if store is not None and self.interview_session_id:
+            store.append(self.interview_session_id, kind, question_id, payload)
+
+    @rx.event(background=True)
+    async def generate_all_question_audio(self):
+        """Resolve the audio URLs and prefetch the questions after the current one.
+
+        The current question itself plays from the streaming endpoint until
+        its file is cached.
+        """
+        async with self:
+            start = max(self.current_question_index, 0)
+            prefetch_end = start + 1 + settings.TTS_PREFETCH_QUESTIONS
+            nearby = self.question_order[start:prefetch_end]
+            variant = self._variant()
+        cached = await asyncio.to_thread(_cached_question_ids, nearby, variant)
+        if cached:
+            async with self:
+                for qid in cached:
+                    self._show_cached_audio(qid)
+
+        async def prefetch(qid: int) -> tuple[int, Optional[str]]:
+            text = QUESTIONS_BY_ID[qid].text
+            return qid, await synthesize_question_audio_async(qid, text, variant)
+
+        for finished in asyncio.as_completed(
+            [prefetch(qid) for qid in nearby[1:] if qid not in cached]
+        ):
+            qid, filename = await finished
+            if filename is not None:
+                async with self:
+                    self._show_cached_audio(qid)
 
     @rx.event
     def next_question(self):
         if self.current_question_index < self.total_questions - 1:
+            preloaded_url = self.next_audio_url
             self.current_question_index += 1
+            self._show_question_audio(preloaded_url)
+            self._log_session_event(
+                session_store.CURSOR, payload=self.current_question_index
+            )
             self.transcript = ""
+            self.interim_transcript = ""
             self.is_ai_speaking = True
+            return InterviewState.generate_all_question_audio
 
     @rx.event
     def prev_question(self):
         if self.current_question_index > 0:
             self.current_question_index -= 1
+            self._show_question_audio()
+            self._log_session_event(
+                session_store.CURSOR, payload=self.current_question_index
+            )
             self.transcript = self.current_answer
+            self.interim_transcript = ""
+            return InterviewState.generate_all_question_audio
 
     @rx.event
     def set_answer(self, text: str):
         if self.current_question:
-            question_id = self.current_question["id"]
+            self._store_answer(self.current_question["id"], text)
+
+    def _store_answer(self, question_id: int, text: str):
+        if self.answers.get(question_id) != text:
             self.answers[question_id] = text
+            self._report_version += 1
+            self._log_session_event(session_store.ANSWER, question_id, text)
 
     @rx.event
     def toggle_recording(self):
         self.is_recording = not self.is_recording
-        if not self.is_recording and self.transcript:
-            self.set_answer(self.transcript)
-            return InterviewState.evaluate_answer
+        if self.is_recording:
+            self._recording_question_id = self.current_question["id"]
+            self._speculated_words = len(self.transcript.split())
+            options = {
+                "intervalMs": settings.TRANSCRIPT_SYNC_INTERVAL_MS,
+                "mode": settings.TRANSCRIPT_SYNC_MODE,
+            }
+            if settings.SPECULATIVE_EVALUATION:
+                options["pauseMs"] = settings.SPECULATIVE_PAUSE_MS
+                options["pauseEvent"] = format_event_handler(
+                    InterviewState.speculate_evaluation
+                )
+            if settings.VAD_ENABLED:
+                options["vadEvent"] = format_event_handler(InterviewState.end_of_speech)
+                options["vadSilenceMs"] = settings.VAD_SILENCE_MS
+                options["vadMinSpeechMs"] = settings.VAD_MIN_SPEECH_MS
+                options["vadThresholdDb"] = settings.VAD_THRESHOLD_DB
+            sync_options = json.dumps(options)
+            return rx.call_script(
+                f"startSpeechRecognition({REFLEX_DISPATCH_JS}, '{format_event_handler(InterviewState.apply_transcript_delta)}', {sync_options})"
+            )
+        return rx.call_script(
+            "stopSpeechRecognition()", callback=InterviewState.finish_recording
+        )
+
+    @rx.event
+    def finish_recording(self, pending: dict):
+        """Apply the last transcript segment and evaluate the recorded answer.
+
+        The browser's stop callback can arrive after the candidate has moved
+        to another question, so the segment goes to the question that was
+        being recorded rather than the current one. Only the first stop of a
+        recording is applied; a second one (a voice activity stop racing a
+        click) is ignored.
+        """
+        question_id = self._recording_question_id
+        if question_id < 0:
+            return
+        self._recording_question_id = -1
+        current = self.current_question
+        if current is not None and current["id"] == question_id:
+            self.apply_transcript_delta(pending.get("appended", ""), "")
+        else:
+            appended = pending.get("appended", "").strip()
+            if appended:
+                answer = self.answers.get(question_id, "")
+                self._store_answer(question_id, f"{answer} {appended}".strip())
+        if pending.get("speechMs"):
+            metrics.ANSWER_SPEECH_SECONDS.observe(
+                pending["speechMs"] / 1000, end=pending.get("end", "manual")
+            )
+        if self.answers.get(question_id):
+            return InterviewState.evaluate_answer(question_id)
+
+    @rx.event
+    def end_of_speech(self, pending: dict):
+        """Sent by speech.js when voice activity detection ends the answer."""
+        if self._recording_question_id < 0:
+            return
+        self.is_recording = False
+        return self.finish_recording(pending)
 
     @rx.event
     def set_transcript(self, transcript: str):
+        metrics.TRANSCRIPT_EVENTS.inc(event="set_transcript")
+        metrics.TRANSCRIPT_BYTES.inc(len(transcript), event="set_transcript")
         self.transcript = transcript
+        self.interim_transcript = ""
         self.set_answer(transcript)
 
+    @rx.event
+    def apply_transcript_delta(self, appended: str, interim: str):
+        """Apply a batched update from speech.js.
+
+        ``appended`` is finalized text recognized since the previous sync and
+        ``interim`` replaces the not-yet-final tail shown in the live transcript.
+        """
+        metrics.TRANSCRIPT_EVENTS.inc(event="apply_transcript_delta")
+        metrics.TRANSCRIPT_BYTES.inc(
+            len(appended) + len(interim), event="apply_transcript_delta"
+        )
+        appended = appended.strip()
+        if appended:
+            self.transcript = f"{self.transcript} {appended}".strip()
+            self.set_answer(self.transcript)
+        if interim != self.interim_transcript:
+            self.interim_transcript = interim
+        if (
+            settings.SPECULATIVE_EVALUATION
+            and settings.SPECULATIVE_MIN_WORDS
+            and self.is_recording
+            and len(self.transcript.split()) - self._speculated_words
+            >= settings.SPECULATIVE_MIN_WORDS
+        ):
+            return InterviewState.speculate_evaluation
+
+    def _speculation_owner(self, question_id: int) -> str:
+        return f"{self.router.session.client_token}:{question_id}"
+
+    @rx.event
+    async def speculate_evaluation(self):
+        """Start evaluating the answer so far while the candidate is speaking.
+
+        Sent by speech.js when the candidate pauses and by
+        ``apply_transcript_delta`` when the answer has grown enough. If the
+        final answer matches, ``evaluate_answer`` reuses the result.
+        """
+        if not (self.is_recording and self.current_question and self.current_answer):
+            return
+        question_text = self.current_question["text"]
+        answer_text = self.current_answer
+        self._speculated_words = len(answer_text.split())
+        evaluator = get_evaluator()
+        speculation.speculate(
+            self._speculation_owner(self.current_question["id"]),
+            evaluator,
+            make_evaluation_key(
+                question_text,
+                answer_text,
+                evaluator.prompt_version,
+                evaluator.model_name,
+            ),
+            question_text,
+            answer_text,
+        )
+
     @rx.event
     def set_ai_speaking(self, is_speaking: bool):
         self.is_ai_speaking = is_speaking
 
     @rx.event
     def setup_audio_listeners(self):
+        speaking_event = format_event_handler(InterviewState.set_ai_speaking)
         return rx.call_script(
-            f"setupAudioEventListeners('{InterviewState.set_ai_speaking.get_name()}', '{InterviewState.set_ai_speaking.get_name()}')"
+            f"setupAudioEventListeners({REFLEX_DISPATCH_JS}, '{speaking_event}', '{speaking_event}')"
         )
 
     @rx.event(background=True)
-    async def evaluate_answer(self):
+    async def evaluate_answer(self, question_id: int):
         async with self:
-            if not self.current_question or not self.current_answer:
+            answer_text = self.answers.get(question_id, "")
+            if question_id not in QUESTIONS_BY_ID or not answer_text:
                 return
             self.is_evaluating = True
-            question_id = self.current_question["id"]
-            question_text = self.current_question["text"]
-            answer_text = self.current_answer
+            question_text = QUESTIONS_BY_ID[question_id].text
+            owner = self._speculation_owner(question_id)
+        started = time.perf_counter()
+        metrics.EVALUATIONS_IN_FLIGHT.inc()
         try:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY not set")
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash",
-                generation_config={"response_mime_type": "application/json"},
+            await self._evaluate(
+                owner, question_id, question_text, answer_text, started
             )
-            prompt = f"""You are an expert Sales & BD interview evaluator.\n\nQuestion: {question_text}\nCandidate's Answer: {answer_text}\n\nEvaluate the answer based on the following rubric, providing a score from 0 to 5 for each category:\n- Relevance: How relevant and on-topic was the answer?\n- Impact/Results: Did the candidate mention measurable outcomes or clear achievements?\n- Strategy/Approach: Did they describe a clear plan or thought process?\n- Clarity & Structure: Was the response well-organized and logical?\n- Communication & Confidence: How clear and confident was their delivery?\n\nReturn a JSON object with this exact structure:\n{{\n  "scores": {{ "relevance": <score>, "impact": <score>, "strategy": <score>, "clarity": <score>, "communication": <score> }},\n  "feedback": "<short, constructive feedback text>",\n  "overall": <average_score>\n}} \n"""
-            response = await model.generate_content_async(prompt)
-            evaluation_data = json.loads(response.text)
+        finally:
+            metrics.EVALUATIONS_IN_FLIGHT.inc(-1)
+
+    def _evaluation_shown(self, started: float):
+        """Clear ``is_evaluating`` and record how long it was set."""
+        if self.is_evaluating:
+            self.is_evaluating = False
+            metrics.EVALUATION_PENDING_SECONDS.observe(time.perf_counter() - started)
+
+    async def _evaluate(
+        self,
+        owner: str,
+        question_id: int,
+        question_text: str,
+        answer_text: str,
+        started: float,
+    ):
+        evaluator = get_evaluator()
+        cache = get_evaluation_cache()
+        cache_key = make_evaluation_key(
+            question_text,
+            answer_text,
+            evaluator.prompt_version,
+            evaluator.model_name,
+        )
+        speculative = await speculation.claim(owner, cache_key)
+        if speculative is not None:
+            async with self:
+                self._record_evaluation(question_id, speculative[1])
+                self._evaluation_shown(started)
+            return
+        cached_evaluation = await cache.get_async(cache_key)
+        metrics.EVALUATION_CACHE.inc(
+            result="miss" if cached_evaluation is None else "hit"
+        )
+        if cached_evaluation is not None:
+            async with self:
+                self._record_evaluation(question_id, cached_evaluation)
+                self._evaluation_shown(started)
+            return
+        try:
+            if settings.EVALUATION_STREAMING:
+                used_evaluator, evaluation_data = await self._stream_evaluation(
+                    question_id, evaluator, question_text, answer_text, started
+                )
+            else:
+                used_evaluator, evaluation_data = await jobs.run(
+                    jobs.EVALUATE,
+                    evaluate_with_fallback,
+                    evaluator,
+                    question_text,
+                    answer_text,
+                )
             async with self:
-                self.evaluations[question_id] = evaluation_data
-                self.is_evaluating = False
+                self._record_evaluation(question_id, evaluation_data)
+                self._evaluation_shown(started)
+            if used_evaluator is evaluator and not is_cut_short(evaluation_data):
+                await cache.put_async(cache_key, evaluation_data)
         except Exception as e:
             logging.exception(f"Error during evaluation: {e}")
             async with self:
-                self.is_evaluating = False
+                self._evaluation_shown(started)
 
-    @rx.event(background=True)
-    async def finalize_interview(self):
-        async with self:
-            self.is_evaluating = True
-        all_answers = "".join(
-            (
-                f"Q{q['id']}: {q['text']}\nA: {self.answers.get(q['id'], 'No answer.')}\n\n"
-                for q in self.questions
-            )
-        )
+    async def _stream_evaluation(
+        self,
+        question_id: int,
+        evaluator: Evaluator,
+        question_text: str,
+        answer_text: str,
+        started: float,
+    ) -> tuple[Evaluator, Evaluation]:
+        """Show each partial evaluation as it streams in; returns the final one.
+
+        The candidate can move on once the scores are in, while the feedback
+        keeps streaming into ``evaluations``. If the stream fails, the partial
+        evaluation is replaced by whatever was there before.
+        """
+        result = None
+        shown = False
+        previous = None
         try:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY not set")
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash",
-                generation_config={"response_mime_type": "application/json"},
+            async for result in jobs.stream(
+                jobs.EVALUATE,
+                stream_with_fallback,
+                evaluator,
+                question_text,
+                answer_text,
+            ):
+                async with self:
+                    if not shown:
+                        previous = self.evaluations.get(question_id)
+                        self._evaluation_shown(started)
+                    self.evaluations[question_id] = result[1]
+                shown = True
+        except Exception:
+            if shown:
+                async with self:
+                    if previous is None:
+                        self.evaluations.pop(question_id, None)
+                    else:
+                        self.evaluations[question_id] = previous
+            raise
+        if result is None:
+            raise RuntimeError("Evaluation stream ended without a result")
+        return result
+
+    def _record_evaluation(self, question_id: int, evaluation: Evaluation):
+        self.evaluations[question_id] = evaluation
+        self._report_version += 1
+        self._log_session_event(session_store.EVALUATION, question_id, evaluation)
+        self.overall_summary = build_summary(self.evaluations)
+        if self.interview_finished:
+            # An evaluation that finished after the results were shown.
+            self._update_result_cards()
+            self._log_session_event(
+                session_store.FINISHED, payload=score_summary(self.evaluations)
             )
-            prompt = f"""You are an expert Sales & BD hiring manager. Based on the full interview transcript below, provide a final summary of the candidate's performance. \n\nTranscript:\n{all_answers}\n\nReturn a JSON object with this exact structure:\n{{\n  "summary": "<A brief 3-4 sentence summary of the candidate's overall strengths and areas for improvement.>",\n  "total_average": <A float representing the average of all question scores from the transcript analysis>\n}}\n"""
-            response = await model.generate_content_async(prompt)
-            summary_data = json.loads(response.text)
-            async with self:
-                self.overall_summary = summary_data
-                self.is_evaluating = False
-                self.interview_finished = True
-        except Exception as e:
-            logging.exception(f"Error during final summary: {e}")
-            async with self:
-                self.is_evaluating = False
+
+    def _update_result_cards(self):
+        self.result_cards = _result_cards(
+            self.question_order, self.answers, self.evaluations, self.cohort_averages
+        )
+
+    @rx.event
+    def finalize_interview(self):
+        with metrics.FINALIZE_SECONDS.time():
+            self.overall_summary = build_summary(self.evaluations)
+            self._update_result_cards()
+        self.interview_finished = True
+        self._log_session_event(
+            session_store.FINISHED, payload=score_summary(self.evaluations)
+        )
+
+    @rx.var
+    def has_cohort(self) -> bool:
+        return bool(self.cohort_averages)
+
+    @rx.event(background=True)
+    async def load_cohort_averages(self):
+        # Imported here so NumPy is only loaded once someone reaches /results.
+        from app import analytics
+
+        averages = await asyncio.to_thread(analytics.cohort_averages)
+        async with self:
+            self.cohort_averages = averages
+            self._update_result_cards()
 
     @rx.var
     def get_current_evaluation(self) -> Evaluation | None:
@@ -265,12 +667,27 @@ class InterviewState(rx.State):
             return self.evaluations.get(self.current_question["id"])
         return None
 
-    @rx.var
-    def get_report_data(self) -> str:
-        report = {
-            "questions": self.questions,
-            "answers": self.answers,
-            "evaluations": self.evaluations,
-            "summary": self.overall_summary,
-        }
-        return json.dumps(report, indent=2)
\ No newline at end of file
+    @rx.event
+    async def download_report(self):
+        """Write the report for the current answers and start its download.
+
+        Reports are streamed to the blob store and memoized on
+        ``_report_version``, so repeated downloads of an unchanged interview
+        reuse the same blob.
+        """
+        if not self._report_id:
+            self._report_id = uuid.uuid4().hex
+        name = report_filename(self._report_id, self._report_version)
+        store = get_blob_store(REPORTS_DIR)
+        if self._report_written_version != self._report_version:
+            report = build_report(
+                self.questions, self.answers, self.evaluations, self.overall_summary
+            )
+            await asyncio.to_thread(write_report, store, name, report)
+            if self._report_written_version >= 0:
+                stale = report_filename(self._report_id, self._report_written_version)
+                await asyncio.to_thread(store.delete, stale)
+            self._report_written_version = self._report_version
+        return rx.call_script(
+            f"(() => {{ const a = document.createElement('a'); a.href = {json.dumps(report_download_url(name))}; document.body.appendChild(a); a.click(); a.remove(); }})()"
+        )
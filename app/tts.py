@@ -0,0 +1,270 @@
+"""Question text-to-speech synthesis backed by the shared audio cache."""
+
+import itertools
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from app import jobs, metrics, scheduler, settings
+from app.audio_cache import get_audio_cache, make_audio_key
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+STANDARD = "standard"
+LITE = "lite"
+
+# Output format of each audio variant of a question.
+AUDIO_VARIANTS = {STANDARD: settings.TTS_OUTPUT_FORMAT}
+if settings.TTS_LITE_OUTPUT_FORMAT:
+    AUDIO_VARIANTS[LITE] = settings.TTS_LITE_OUTPUT_FORMAT
+
+
+@lru_cache(maxsize=1)
+def get_elevenlabs_client() -> Optional["ElevenLabs"]:
+    if not settings.ELEVENLABS_API_KEY:
+        return None
+    # Imported on first use; the SDK adds noticeably to worker start-up.
+    from elevenlabs.client import ElevenLabs
+
+    return ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+
+
+def _count_bytes(chunks: Iterable[bytes], source: str) -> Iterator[bytes]:
+    for chunk in chunks:
+        metrics.TTS_BYTES.inc(len(chunk), source=source)
+        yield chunk
+
+
+@lru_cache(maxsize=1024)
+def question_audio_key(text: str, variant: str = STANDARD) -> str:
+    return make_audio_key(
+        text,
+        settings.TTS_VOICE_ID,
+        settings.TTS_MODEL_ID,
+        AUDIO_VARIANTS[variant],
+    )
+
+
+def cached_question_audio(text: str, variant: str = STANDARD) -> Optional[str]:
+    """The cached audio blob name for a question, without synthesizing it."""
+    return get_audio_cache().get(question_audio_key(text, variant))
+
+
+def synthesize_question_audio(
+    question_id: int, text: str, variant: str = STANDARD
+) -> Optional[str]:
+    """Return the cached audio filename for a question, synthesizing it if needed.
+
+    This blocks on the ElevenLabs download, so call it from a worker thread.
+    """
+    started = time.perf_counter()
+    cached_file = cached_question_audio(text, variant)
+    if cached_file is not None:
+        metrics.TTS_SECONDS.observe(time.perf_counter() - started, source="cache")
+        return cached_file
+    client = get_elevenlabs_client()
+    if client is None:
+        logging.warning(
+            f"ELEVENLABS_API_KEY not set. Skipping audio generation for question {question_id}. The interview will proceed without audio."
+        )
+        return None
+    from elevenlabs.core import ApiError
+
+    key = question_audio_key(text, variant)
+
+    def download() -> str:
+        audio_generator = client.text_to_speech.convert(
+            text=text,
+            voice_id=settings.TTS_VOICE_ID,
+            model_id=settings.TTS_MODEL_ID,
+            output_format=AUDIO_VARIANTS[variant],
+        )
+        return get_audio_cache().put(key, _count_bytes(audio_generator, "elevenlabs"))
+
+    try:
+        # Keyed by the audio key, so sessions prefetching the same question at
+        # once share a single download.
+        filename = scheduler.call(scheduler.ELEVENLABS, download, key=key)
+        metrics.TTS_SECONDS.observe(
+            time.perf_counter() - started, source="elevenlabs"
+        )
+        return filename
+    except ApiError as e:
+        metrics.TTS_ERRORS.inc(status=str(e.status_code))
+        if e.status_code == 401:
+            logging.warning(
+                f"ElevenLabs API key is missing text-to-speech permission for question {question_id}. The interview will continue without audio for this question."
+            )
+        else:
+            logging.exception(
+                f"An ElevenLabs API error occurred for question {question_id}: {e}"
+            )
+    except scheduler.CircuitOpenError as e:
+        metrics.TTS_ERRORS.inc(status="circuit_open")
+        logging.warning(f"Skipping audio for question {question_id}: {e}")
+    except Exception as e:
+        metrics.TTS_ERRORS.inc(status="exception")
+        logging.exception(
+            f"An unexpected error occurred generating audio for question {question_id}: {e}"
+        )
+    return None
+
+
+async def synthesize_question_audio_async(
+    question_id: int,
+    text: str,
+    variant: str = STANDARD,
+    priority: int = jobs.TTS_PREFETCH,
+) -> Optional[str]:
+    """Run ``synthesize_question_audio`` in the job pool."""
+    return await jobs.run(
+        priority, synthesize_question_audio, question_id, text, variant
+    )
+
+
+_stream_sources: dict[str, tuple[int, str, str]] = {}
+
+
+def register_question_stream(question_id: int, text: str):
+    """Make every variant of a question's audio servable by its key."""
+    for variant in AUDIO_VARIANTS:
+        _stream_sources[question_audio_key(text, variant)] = (
+            question_id,
+            text,
+            variant,
+        )
+
+
+def get_question_stream_source(key: str) -> Optional[tuple[int, str, str]]:
+    """``(question_id, text, variant)`` for a registered audio key."""
+    return _stream_sources.get(key)
+
+
+class _AudioRelay:
+    """Chunks of one TTS stream, replayed to every request for that audio."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._done = False
+        self._changed = threading.Condition()
+
+    def append(self, chunk: bytes):
+        with self._changed:
+            self._chunks.append(chunk)
+            self._changed.notify_all()
+
+    def close(self):
+        with self._changed:
+            self._done = True
+            self._changed.notify_all()
+
+    def __iter__(self) -> Iterator[bytes]:
+        sent = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(
+                    lambda: sent < len(self._chunks) or self._done
+                )
+                chunks = self._chunks[sent:]
+            if not chunks:
+                return
+            sent += len(chunks)
+            yield from chunks
+
+
+_relays: dict[str, _AudioRelay] = {}
+_relays_lock = threading.Lock()
+
+
+def _relay_question_audio(
+    question_id: int, text: str, variant: str, key: str, relay: _AudioRelay
+):
+    """Stream TTS into ``relay`` and the audio cache until it is complete.
+
+    This runs in its own thread, so the audio is still cached if every
+    listener goes away.
+    """
+    client = get_elevenlabs_client()
+    from elevenlabs.core import ApiError
+
+    def open_stream() -> Iterator[bytes]:
+        # The request is only sent on the first read, so take the first chunk
+        # here to let the scheduler retry a failed start.
+        chunks = iter(
+            client.text_to_speech.stream(
+                text=text,
+                voice_id=settings.TTS_VOICE_ID,
+                model_id=settings.TTS_MODEL_ID,
+                output_format=AUDIO_VARIANTS[variant],
+            )
+        )
+        return itertools.chain([next(chunks, b"")], chunks)
+
+    try:
+        with metrics.TTS_SECONDS.time(source="stream"):
+            audio_stream = scheduler.call(scheduler.ELEVENLABS, open_stream)
+            for chunk in get_audio_cache().tee(
+                key, _count_bytes(audio_stream, "stream")
+            ):
+                relay.append(chunk)
+    except ApiError as e:
+        metrics.TTS_ERRORS.inc(status=str(e.status_code))
+        logging.exception(
+            f"An ElevenLabs API error occurred streaming question {question_id}: {e}"
+        )
+    except scheduler.CircuitOpenError as e:
+        metrics.TTS_ERRORS.inc(status="circuit_open")
+        logging.warning(f"Cannot stream audio for question {question_id}: {e}")
+    except Exception as e:
+        metrics.TTS_ERRORS.inc(status="exception")
+        logging.exception(
+            f"An unexpected error occurred streaming question {question_id}: {e}"
+        )
+    finally:
+        with _relays_lock:
+            del _relays[key]
+        relay.close()
+
+
+def stream_question_audio(
+    question_id: int, text: str, variant: str = STANDARD
+) -> Iterator[bytes]:
+    """Relay TTS chunks as they arrive, teeing them into the audio cache.
+
+    Concurrent requests for the same audio share one TTS stream: the first
+    starts it, and later ones replay what has arrived so far and then follow
+    it. A request that arrives after the stream finished reads the cache.
+    """
+    if get_elevenlabs_client() is None:
+        logging.warning(
+            f"ELEVENLABS_API_KEY not set. Cannot stream audio for question {question_id}."
+        )
+        return
+    key = question_audio_key(text, variant)
+    relay = _relays.get(key)
+    leader = False
+    if relay is None:
+        cached_file = cached_question_audio(text, variant)
+        if cached_file is not None:
+            with get_audio_cache().store.open(cached_file) as body:
+                while chunk := body.read(64 * 1024):
+                    yield chunk
+            return
+        with _relays_lock:
+            relay = _relays.get(key)
+            leader = relay is None
+            if leader:
+                relay = _relays[key] = _AudioRelay()
+        if leader:
+            threading.Thread(
+                target=_relay_question_audio,
+                args=(question_id, text, variant, key, relay),
+                name="tts-stream",
+                daemon=True,
+            ).start()
+    if not leader:
+        metrics.API_REQUESTS.inc(provider=scheduler.ELEVENLABS, outcome="coalesced")
+    yield from relay
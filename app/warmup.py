@@ -0,0 +1,97 @@
+"""Boot-time warm-up and start-up timing for a backend worker.
+
+Provider SDKs are imported lazily, so a worker that only serves pages never
+loads them. ``warm_up`` runs as a Reflex lifespan task: after the worker has
+started accepting requests, it imports the SDKs and opens their connections.
+It also starts the job pool, opens the session store and checks that the
+first questions' audio is cached. Each step's duration goes to
+``interview_startup_seconds``, and a one-line report is logged when warm-up
+finishes.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable
+
+from app import jobs, metrics, scheduler, settings
+from app.evaluators import get_evaluator
+from app.questions import DEFAULT_QUESTION_ORDER, QUESTIONS_BY_ID
+from app.session_store import get_session_store
+from app.tts import (
+    cached_question_audio,
+    get_elevenlabs_client,
+    synthesize_question_audio,
+)
+
+_imported_at = time.perf_counter()
+_steps: dict[str, float] = {}
+
+
+def _record(step: str, seconds: float):
+    _steps[step] = seconds
+    metrics.STARTUP_SECONDS.set(seconds, step=step)
+
+
+def app_loaded():
+    """Mark the app module as imported; call once at the end of app/app.py."""
+    _record("app_import", time.perf_counter() - _imported_at)
+
+
+def startup_report() -> str:
+    return ", ".join(f"{step} {seconds:.2f}s" for step, seconds in _steps.items())
+
+
+async def _timed(step: str, work: Awaitable):
+    started = time.perf_counter()
+    try:
+        await work
+    except Exception as e:
+        logging.warning(f"Warm-up step {step} failed: {e!r}")
+    _record(step, time.perf_counter() - started)
+
+
+def _warm_elevenlabs():
+    client = get_elevenlabs_client()
+    if client is None:
+        return
+    # A cheap authenticated request leaves a connection in the pool.
+    scheduler.call(scheduler.ELEVENLABS, client.models.list)
+
+
+def _check_audio_cache():
+    """Queue synthesis of the opening questions if their audio is not cached."""
+    opening = DEFAULT_QUESTION_ORDER[: max(settings.TTS_PREFETCH_QUESTIONS, 1)]
+    missing = [
+        qid
+        for qid in opening
+        if cached_question_audio(QUESTIONS_BY_ID[qid].text) is None
+    ]
+    if missing and get_elevenlabs_client() is not None:
+        logging.info(f"Warm-up: synthesizing audio for questions {missing}")
+        for qid in missing:
+            jobs.submit(
+                jobs.TTS_PREFETCH,
+                synthesize_question_audio,
+                qid,
+                QUESTIONS_BY_ID[qid].text,
+            )
+
+
+async def warm_up():
+    """Lifespan task that prepares this worker for its first interview."""
+    started = time.perf_counter()
+    await _timed("job_pool", asyncio.to_thread(jobs.get_job_pool))
+    evaluator = get_evaluator()
+    await asyncio.gather(
+        _timed("audio_cache", asyncio.to_thread(_check_audio_cache)),
+        _timed("session_store", asyncio.to_thread(get_session_store)),
+        _timed("elevenlabs", asyncio.to_thread(_warm_elevenlabs)),
+        # Evaluations run on the job pool's loop, and async clients keep
+        # their connections on the loop that opened them.
+        _timed(
+            f"evaluator_{evaluator.name}", jobs.run(jobs.WARM_UP, evaluator.warm_up)
+        ),
+    )
+    _record("warm_up", time.perf_counter() - started)
+    logging.info(f"Worker warmed up: {startup_report()}")
@@ -0,0 +1,284 @@
+// Browser-side speech recognition and transcript sync for the interview page.
+//
+// Interim Web Speech results are buffered here and only the text appended
+// since the last sync (plus, in "interim" mode, the current interim tail) is
+// sent to the backend at a fixed cadence, instead of one state event per
+// recognition result.
+//
+// When a pauseEvent is configured, it is dispatched once each time the
+// finalized transcript has stopped growing for pauseMs, so the backend can
+// start evaluating the answer before the candidate stops recording.
+//
+// When a vadEvent is configured, voice activity detection ends the answer on
+// its own. Microphone energy is sampled through an AnalyserNode (falling back
+// to transcript timing if the microphone cannot be opened). Leading silence is
+// ignored; once the candidate has spoken for vadMinSpeechMs, vadSilenceMs of
+// trailing silence stops recognition and dispatches vadEvent with the final
+// delta and the voiced span (speechMs), trimmed of leading and trailing
+// silence.
+(function () {
+  let recognition = null;
+  let dispatch = null;
+  let deltaEvent = null;
+  let options = { intervalMs: 750, mode: "interim", lang: "en-US" };
+  let active = false;
+  let finalText = "";
+  let interimText = "";
+  let sentLength = 0;
+  let sentInterim = "";
+  let lastGrowthAt = 0;
+  let pausedLength = 0;
+  let timer = null;
+  let stopResolver = null;
+  // Set from the moment a stop starts until recognition has ended, so a VAD
+  // stop and a manual stop never both submit the answer.
+  let stopping = false;
+  let vad = null;
+
+  const VAD_SAMPLE_MS = 50;
+
+  function joinSegment(text, segment) {
+    segment = segment.trim();
+    if (!segment) {
+      return text;
+    }
+    return text ? text + " " + segment : segment;
+  }
+
+  function visibleInterim() {
+    return options.mode === "interim" ? interimText.trim() : "";
+  }
+
+  function takeAppended() {
+    const appended = finalText.slice(sentLength);
+    sentLength = finalText.length;
+    return appended;
+  }
+
+  function flush() {
+    if (!dispatch || !deltaEvent) {
+      return;
+    }
+    const interim = visibleInterim();
+    if (finalText.length !== sentLength || interim !== sentInterim) {
+      sentInterim = interim;
+      dispatch(deltaEvent, { appended: takeAppended(), interim: interim });
+    }
+    checkPause();
+    checkEndOfSpeech();
+  }
+
+  function checkPause() {
+    if (
+      options.pauseEvent &&
+      finalText.length > pausedLength &&
+      !interimText.trim() &&
+      Date.now() - lastGrowthAt >= options.pauseMs
+    ) {
+      pausedLength = finalText.length;
+      dispatch(options.pauseEvent, {});
+    }
+  }
+
+  function startVad() {
+    if (!options.vadEvent || !navigator.mediaDevices || !window.AudioContext) {
+      return;
+    }
+    navigator.mediaDevices
+      .getUserMedia({ audio: { echoCancellation: true, noiseSuppression: true } })
+      .then(function (stream) {
+        if (!active || vad) {
+          stream.getTracks().forEach(function (track) {
+            track.stop();
+          });
+          return;
+        }
+        const context = new AudioContext();
+        const analyser = context.createAnalyser();
+        analyser.fftSize = 2048;
+        context.createMediaStreamSource(stream).connect(analyser);
+        vad = {
+          stream: stream,
+          context: context,
+          analyser: analyser,
+          samples: new Float32Array(analyser.fftSize),
+          firstVoiceAt: 0,
+          lastVoiceAt: 0,
+          voicedMs: 0,
+          sampledAt: Date.now(),
+          timer: setInterval(sampleLevel, VAD_SAMPLE_MS),
+        };
+      })
+      .catch(function (error) {
+        console.warn("Voice activity detection uses transcript timing:", error);
+      });
+  }
+
+  function sampleLevel() {
+    const samples = vad.samples;
+    vad.analyser.getFloatTimeDomainData(samples);
+    let energy = 0;
+    for (let i = 0; i < samples.length; i++) {
+      energy += samples[i] * samples[i];
+    }
+    const levelDb = 10 * Math.log10(energy / samples.length + 1e-12);
+    const now = Date.now();
+    if (levelDb >= options.vadThresholdDb) {
+      if (!vad.firstVoiceAt) {
+        vad.firstVoiceAt = now;
+      }
+      vad.voicedMs += now - vad.sampledAt;
+      vad.lastVoiceAt = now;
+    }
+    vad.sampledAt = now;
+    checkEndOfSpeech();
+  }
+
+  function stopVad() {
+    if (!vad) {
+      return 0;
+    }
+    clearInterval(vad.timer);
+    vad.stream.getTracks().forEach(function (track) {
+      track.stop();
+    });
+    vad.context.close();
+    const speechMs = vad.lastVoiceAt - vad.firstVoiceAt;
+    vad = null;
+    return speechMs;
+  }
+
+  function checkEndOfSpeech() {
+    if (
+      !options.vadEvent ||
+      !active ||
+      stopping ||
+      !finalText ||
+      interimText.trim()
+    ) {
+      return;
+    }
+    // Without the microphone level, a stalled transcript stands in for silence.
+    const spoke = vad ? vad.voicedMs >= options.vadMinSpeechMs : true;
+    const lastSpeechAt = vad ? vad.lastVoiceAt : lastGrowthAt;
+    if (spoke && Date.now() - lastSpeechAt >= options.vadSilenceMs) {
+      active = false;
+      stopping = true;
+      stopResolver = function (result) {
+        result.end = "vad";
+        dispatch(options.vadEvent, { pending: result });
+      };
+      recognition.stop();
+    }
+  }
+
+  function handleResult(event) {
+    let interim = "";
+    for (let i = event.resultIndex; i < event.results.length; i++) {
+      const result = event.results[i];
+      if (result.isFinal) {
+        finalText = joinSegment(finalText, result[0].transcript);
+        lastGrowthAt = Date.now();
+      } else {
+        interim = joinSegment(interim, result[0].transcript);
+      }
+    }
+    interimText = interim;
+  }
+
+  function handleEnd() {
+    if (active) {
+      // Chrome ends continuous recognition after a pause; keep listening
+      // until the candidate stops recording.
+      recognition.start();
+      return;
+    }
+    clearInterval(timer);
+    timer = null;
+    finalText = joinSegment(finalText, interimText);
+    interimText = "";
+    const appended = takeAppended();
+    const speechMs = stopVad();
+    recognition = null;
+    stopping = false;
+    if (stopResolver) {
+      const resolve = stopResolver;
+      stopResolver = null;
+      resolve({ appended: appended, speechMs: speechMs, end: "manual" });
+    }
+  }
+
+  window.startSpeechRecognition = function (dispatchFn, eventName, config) {
+    const Recognition =
+      window.SpeechRecognition || window.webkitSpeechRecognition;
+    if (!Recognition) {
+      console.warn("Speech recognition is not supported in this browser.");
+      return;
+    }
+    if (recognition) {
+      return;
+    }
+    dispatch = dispatchFn;
+    deltaEvent = eventName;
+    options = Object.assign({}, options, config || {});
+    finalText = "";
+    interimText = "";
+    sentLength = 0;
+    sentInterim = "";
+    lastGrowthAt = Date.now();
+    pausedLength = 0;
+    active = true;
+    stopping = false;
+
+    recognition = new Recognition();
+    recognition.continuous = true;
+    recognition.interimResults = true;
+    recognition.lang = options.lang;
+    recognition.onresult = handleResult;
+    recognition.onend = handleEnd;
+    recognition.onerror = function (event) {
+      console.warn("Speech recognition error:", event.error);
+    };
+    recognition.start();
+    timer = setInterval(flush, options.intervalMs);
+    startVad();
+  };
+
+  window.stopSpeechRecognition = function () {
+    return new Promise(function (resolve) {
+      if (stopping) {
+        // Voice activity detection is already stopping: deliver its result
+        // here instead of through vadEvent, so it is submitted only once.
+        stopResolver = function (result) {
+          result.end = "vad";
+          resolve(result);
+        };
+        return;
+      }
+      if (!recognition || !active) {
+        resolve({ appended: "" });
+        return;
+      }
+      active = false;
+      stopping = true;
+      stopResolver = resolve;
+      recognition.stop();
+    });
+  };
+
+  window.setupAudioEventListeners = function (dispatchFn, startEvent, endEvent) {
+    const audio = document.getElementById("question-audio");
+    if (!audio) {
+      return;
+    }
+    audio.addEventListener("play", function () {
+      dispatchFn(startEvent, { is_speaking: true });
+    });
+    audio.addEventListener("ended", function () {
+      dispatchFn(endEvent, { is_speaking: false });
+    });
+    audio.addEventListener("pause", function () {
+      dispatchFn(endEvent, { is_speaking: false });
+    });
+  };
+})();
@@ -0,0 +1,316 @@
+"""Simulate concurrent candidates against one in-process Reflex worker.
+
+Each simulated candidate drives ``InterviewState`` through the same event
+sequence the browser sends: hydrate, ``start_interview``, bursts of
+``apply_transcript_delta``, ``toggle_recording`` on and off (with the
+``finish_recording`` callback speech.js would return), ``next_question`` and
+finally ``finalize_interview``. ElevenLabs and the evaluation model are
+replaced by local stand-ins with configurable latency. Every session gives
+different answers, so evaluations are not served from the evaluation cache.
+
+Memory per session is measured in a second, untimed pass, because tracing
+allocations slows every event down.
+
+Run from the repo root:
+
+    python -m benchmarks.load_test --sessions 100 --eval-latency 1.5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from types import SimpleNamespace
+
+ANSWER_WORDS = (
+    "first I researched the target segment and built a territory plan then "
+    "we qualified leads through discovery calls which increased pipeline by "
+    "thirty percent and we closed two enterprise deals finally I exceeded quota"
+).split()
+
+
+class FakeTextToSpeech:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def convert(self, **kwargs):
+        time.sleep(self.latency)
+        return iter([b"\xff\xfb" + b"\x00" * 4096 for _ in range(8)])
+
+    stream = convert
+
+
+def install_stand_ins(args):
+    """Swap ElevenLabs and the evaluation model for local simulations."""
+    from app import evaluators, settings, state, tts
+
+    fake_client = SimpleNamespace(
+        text_to_speech=FakeTextToSpeech(args.tts_latency)
+    )
+    tts.get_elevenlabs_client = lambda: fake_client
+    state.get_elevenlabs_client = lambda: fake_client
+
+    class SimulatedEvaluator(evaluators.RubricEvaluator):
+        name = "simulated"
+
+        async def evaluate(self, question_text, answer_text):
+            await asyncio.sleep(args.eval_latency)
+            return self.score(question_text, answer_text)
+
+    evaluators.EVALUATORS[SimulatedEvaluator.name] = SimulatedEvaluator
+    settings.EVALUATOR_BACKEND = SimulatedEvaluator.name
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    """Collects per-event latencies and state delta sizes."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.delta_bytes: dict[str, int] = defaultdict(int)
+        self.events = 0
+
+    def record(self, name: str, seconds: float, nbytes: int):
+        self.latencies[name].append(seconds)
+        self.delta_bytes[name] += nbytes
+        self.events += 1
+
+
+class SimulatedClient:
+    """Plays the browser's role for one candidate."""
+
+    def __init__(self, rx_app, recorder: Recorder, args, index: int):
+        from reflex import constants
+
+        self.app = rx_app
+        self.index = index
+        self.recorder = recorder
+        self.args = args
+        self.token = str(uuid.uuid4())
+        self.sid = f"sid-{self.token}"
+        self.router_data = {
+            constants.RouteVar.PATH: "/",
+            constants.RouteVar.ORIGIN: "/",
+            constants.RouteVar.QUERY: {},
+        }
+
+    async def send(self, handler_name: str, payload: dict | None = None):
+        from reflex.app import process
+        from reflex.event import Event
+
+        queue = [
+            Event(self.token, handler_name, dict(self.router_data), payload or {})
+        ]
+        while queue:
+            event = queue.pop(0)
+            short_name = event.name.rpartition(".")[2]
+            started = time.perf_counter()
+            nbytes = 0
+            async for update in process(self.app, event, self.sid, {}, "127.0.0.1"):
+                nbytes += len(update.json())
+                queue.extend(self.follow_up_events(update.events))
+            self.recorder.record(short_name, time.perf_counter() - started, nbytes)
+
+    def follow_up_events(self, events) -> list:
+        """Events the frontend would send back after an update."""
+        from reflex.event import Event
+
+        follow_ups = []
+        for event in events:
+            if event.name == "_call_script":
+                callback = str(event.payload.get("callback") or "")
+                if "finish_recording" in callback:
+                    follow_ups.append(
+                        Event(
+                            self.token,
+                            self.handler("finish_recording"),
+                            dict(self.router_data),
+                            {"pending": {"appended": ""}},
+                        )
+                    )
+                elif "set_audio_variant" in callback:
+                    follow_ups.append(
+                        Event(
+                            self.token,
+                            self.handler("set_audio_variant"),
+                            dict(self.router_data),
+                            {"hints": {}},
+                        )
+                    )
+            elif "." in event.name:
+                follow_ups.append(
+                    Event(self.token, event.name, dict(self.router_data), event.payload)
+                )
+        return follow_ups
+
+    def handler(self, name: str) -> str:
+        from reflex.utils.format import format_event_handler
+
+        from app.state import InterviewState
+
+        return format_event_handler(getattr(InterviewState, name))
+
+    async def wait_for_background_tasks(self):
+        suffix = f"|{self.token}"
+        while pending := [
+            task
+            for task in self.app._background_tasks
+            if task.get_name().endswith(suffix)
+        ]:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run_interview(self, question_count: int):
+        import reflex as rx
+        from reflex.event import get_hydrate_event
+
+        await self.send(get_hydrate_event(rx.State))
+        await self.send(self.handler("start_interview"))
+        for question in range(question_count):
+            await self.send(self.handler("toggle_recording"))
+            for burst in range(self.args.bursts):
+                start = burst * self.args.words_per_burst % len(ANSWER_WORDS)
+                words = ANSWER_WORDS[start : start + self.args.words_per_burst]
+                if burst == 0:
+                    # Makes the answer unique, so it misses the eval cache.
+                    words = [f"candidate{self.token[:8]}", *words]
+                await self.send(
+                    self.handler("apply_transcript_delta"),
+                    {"appended": " ".join(words), "interim": words[-1]},
+                )
+                await asyncio.sleep(self.args.think_time)
+            await self.send(self.handler("toggle_recording"))
+            await self.wait_for_background_tasks()
+            if question < question_count - 1:
+                await self.send(self.handler("next_question"))
+        await self.send(self.handler("finalize_interview"))
+        await self.wait_for_background_tasks()
+
+
+async def run_sessions(rx_app, recorder: Recorder, args) -> float:
+    """Run ``args.sessions`` concurrent interviews and return the wall time."""
+    from app.questions import DEFAULT_QUESTION_ORDER
+
+    clients = [
+        SimulatedClient(rx_app, recorder, args, i) for i in range(args.sessions)
+    ]
+    started = time.perf_counter()
+
+    async def run_client(client: SimulatedClient):
+        await asyncio.sleep(client.index * args.ramp)
+        await client.run_interview(args.questions or len(DEFAULT_QUESTION_ORDER))
+
+    await asyncio.gather(*(run_client(c) for c in clients))
+    return time.perf_counter() - started
+
+
+async def run(args) -> tuple[Recorder, float, float]:
+    from app.app import app as rx_app
+
+    install_stand_ins(args)
+    recorder = Recorder()
+
+    async def record_emit(update, token):
+        recorder.delta_bytes["<background>"] += len(update.json())
+
+    rx_app.event_namespace.emit_update = record_emit
+    elapsed = await run_sessions(rx_app, recorder, args)
+
+    async def discard_emit(update, token):
+        pass
+
+    rx_app.event_namespace.emit_update = discard_emit
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await run_sessions(rx_app, Recorder(), args)
+    memory_per_session = (tracemalloc.get_traced_memory()[0] - baseline) / max(
+        args.sessions, 1
+    )
+    tracemalloc.stop()
+    return recorder, elapsed, memory_per_session
+
+
+def report(recorder: Recorder, elapsed: float, memory_per_session: float, args):
+    rows = [("event", "count", "p50 ms", "p95 ms", "p99 ms", "delta KiB")]
+    all_samples = []
+    for name, samples in sorted(recorder.latencies.items()):
+        all_samples.extend(samples)
+        rows.append(
+            (
+                name,
+                str(len(samples)),
+                f"{percentile(samples, 50) * 1000:.1f}",
+                f"{percentile(samples, 95) * 1000:.1f}",
+                f"{percentile(samples, 99) * 1000:.1f}",
+                f"{recorder.delta_bytes[name] / 1024:.1f}",
+            )
+        )
+    rows.append(
+        (
+            "all",
+            str(len(all_samples)),
+            f"{percentile(all_samples, 50) * 1000:.1f}",
+            f"{percentile(all_samples, 95) * 1000:.1f}",
+            f"{percentile(all_samples, 99) * 1000:.1f}",
+            f"{sum(recorder.delta_bytes.values()) / 1024:.1f}",
+        )
+    )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    print()
+    print(f"sessions:            {args.sessions}")
+    print(f"wall time:           {elapsed:.2f} s")
+    print(f"throughput:          {recorder.events / elapsed:.1f} events/s")
+    print(f"interviews/minute:   {args.sessions / elapsed * 60:.1f}")
+    print(f"mean event latency:  {statistics.fmean(all_samples) * 1000:.1f} ms")
+    print(f"memory per session:  {memory_per_session / 1024:.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument(
+        "--questions",
+        type=int,
+        default=None,
+        help="Questions answered per session (default: all).",
+    )
+    parser.add_argument(
+        "--ramp", type=float, default=0.01, help="Seconds between session starts."
+    )
+    parser.add_argument(
+        "--bursts", type=int, default=10, help="Transcript syncs per answer."
+    )
+    parser.add_argument("--words-per-burst", type=int, default=4)
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="Seconds between syncs."
+    )
+    parser.add_argument("--eval-latency", type=float, default=1.0)
+    parser.add_argument("--tts-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="interview-bench-")
+    os.environ.setdefault("REFLEX_UPLOADED_FILES_DIR", scratch)
+    # Keep simulated sessions out of the real store, so they never reach the
+    # cohort averages or exports. Persistence still runs, so it is measured.
+    os.environ.setdefault(
+        "SESSION_STORE_PATH", os.path.join(scratch, "interview_sessions.db")
+    )
+    recorder, elapsed, memory_per_session = asyncio.run(run(args))
+    report(recorder, elapsed, memory_per_session, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.scheduler import CircuitBreaker, CircuitOpenError, Provider
+
+
+def open_circuit(provider: Provider):
+    provider.breaker = CircuitBreaker(provider.name, threshold=1, reset_seconds=0)
+    provider.breaker.record_failure()
+    assert provider.breaker.is_open
+
+
+def test_cancelled_trial_reopens_circuit_and_lets_next_trial_through():
+    provider = Provider("test", rate=0, burst=1, max_concurrency=1, max_retries=0)
+    open_circuit(provider)
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def succeed():
+        return "ok"
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider.call_async(hang), timeout=0.01)
+        assert provider.breaker.is_open
+        assert not provider.breaker._trial_running
+        return await provider.call_async(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert not provider.breaker.is_open
+
+
+def test_cancelled_call_counts_as_failure():
+    provider = Provider("test", rate=0, burst=1, max_concurrency=1, max_retries=0)
+    provider.breaker = CircuitBreaker(provider.name, threshold=1, reset_seconds=60)
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def scenario():
+        task = asyncio.create_task(provider.call_async(hang))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        with pytest.raises(CircuitOpenError):
+            await provider.call_async(hang)
+
+    asyncio.run(scenario())
+
+
+def test_trial_cancelled_before_calling_out_is_released():
+    provider = Provider("test", rate=0, burst=1, max_concurrency=1, max_retries=0)
+    open_circuit(provider)
+    calls = []
+
+    def record():
+        calls.append(True)
+
+    async def record_async():
+        record()
+
+    async def scenario():
+        # Hold the only slot, so the trial is cancelled while waiting for it.
+        await provider._async_slots.acquire()
+        task = asyncio.create_task(provider.call_async(record_async))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        provider._async_slots.release()
+
+    asyncio.run(scenario())
+    assert not calls
+    assert not provider.breaker._trial_running
+    provider.call(record)
+    assert calls and not provider.breaker.is_open